@@ -1,16 +1,17 @@
 import streamlit as st
 
+# streamlit 은 이 스크립트를 __main__ 으로 실행하므로, 작업 프로세스(spawn)가 다시 불러올 때는 실행되지 않음
+if __name__ == "__main__":
+    pages = {
+        "🕵️‍♂️ ISD-Agent": [
+            # 로그인 기능 비활성화 (주석 처리)
+            # st.Page("pages/00_메인페이지.py", title="🔑 시스템 로그인"),  
+            st.Page("pages/00_메인페이지.py", title="🏠 메인 페이지"),  # 로그인 없이 메인 페이지로 변경
+            st.Page("pages/01_요약하기.py", title="📝 에이전트 요약"), 
+            st.Page("pages/02_분석하기.py", title="📊 에이전트 분석"),
+            st.Page("pages/03_정리하기.py", title="📑 보고서 정리"),
+        ],
+    }
 
-pages = {
-    "🕵️‍♂️ ISD-Agent": [
-        # 로그인 기능 비활성화 (주석 처리)
-        # st.Page("pages/00_메인페이지.py", title="🔑 시스템 로그인"),  
-        st.Page("pages/00_메인페이지.py", title="🏠 메인 페이지"),  # 로그인 없이 메인 페이지로 변경
-        st.Page("pages/01_요약하기.py", title="📝 에이전트 요약"), 
-        st.Page("pages/02_분석하기.py", title="📊 에이전트 분석"),
-        st.Page("pages/03_정리하기.py", title="📑 보고서 정리"),
-    ],
-}
-
-pg = st.navigation(pages)
-pg.run()
+    pg = st.navigation(pages)
+    pg.run()
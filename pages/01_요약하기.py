@@ -10,20 +10,22 @@ import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 import magic
-import PyPDF2
-import io
 import logging
 import os
 import pytz  # Add this import at the top with other imports
+import time
 import uuid  # Add this import at the top with other imports
 import streamlit as st
 import sys
 
 from datetime import datetime
+from functools import partial
 
-from src.components.llm import get_chat_completion
+from src.components.llm import LLMError, get_chat_completion, run_streaming
 from src.components.prompts import CLIENT_REQUIREMENTS_PROMPT, INTERVIEW_PROMPT, RELATED_DOCUMENTS_PROMPT
 from src.components.sidebar import render_sidebar
+from src.components.summarizer import summarize_documents, summarize_long_text
+from src.utils.pdf_handler import extract_pdf_pages
 # [DISABLED] AWS DynamoDB 연동 import
 # DynamoDBManager: 분석 결과를 DynamoDB/S3에 저장하는 클래스 (src/components/db.py 참고)
 # 재활성화 시 아래 주석 해제 및 analyze_files() 내 db_manager 호출 코드 주석 해제 필요
@@ -34,6 +36,24 @@ from src.components.sidebar import render_sidebar
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 요약 요청 동시 실행 개수 (클라이언트 / 인터뷰 / 기타 파일)
+SUMMARY_MAX_CONCURRENCY = int(os.environ.get("SUMMARY_MAX_CONCURRENCY", "3"))
+
+# 스트리밍 중 요약 결과 영역의 초당 최대 갱신 횟수
+STREAM_RENDER_HZ = 10
+
+# 요약 결과 key별 화면 표시 이름 및 DB 저장 context
+ANALYSIS_LABELS = {
+    "client_analysis": "클라이언트 요구사항 분석",
+    "interview_analysis": "인터뷰 핵심 내용 정리",
+    "other_files_analysis": "기타 파일 통합 분석",
+}
+ANALYSIS_CONTEXTS = {
+    "client_analysis": "requirements_analysis",
+    "interview_analysis": "interview_analysis",
+    "other_files_analysis": "other_files_analysis",
+}
+
 #--------------------------------#
 #         Streamlit App          #
 #--------------------------------#
@@ -80,23 +100,34 @@ if "interview_analysis" not in st.session_state:
 if "other_files_analysis" not in st.session_state:
     st.session_state["other_files_analysis"] = None
 
+# 기타 파일 문서별 요약 캐시 (프롬프트 해시 -> 요약)
+if "other_file_summaries" not in st.session_state:
+    st.session_state["other_file_summaries"] = {}
+
 ### PDF-File Handler
-def process_pdf_file(file) -> str:
-    """PDF 파일을 처리하고 텍스트를 추출하는 헬퍼 함수"""
+def process_pdf_pages(file) -> list:
+    """PDF 파일을 처리하고 페이지별 텍스트 목록을 추출하는 헬퍼 함수"""
     content_type = magic.from_buffer(file.read(1024), mime=True)
     file.seek(0)
     
     if content_type != "application/pdf":
         st.error("PDF 파일만 업로드 가능합니다.")
     
-    contents = file.read()
-    pdf = PyPDF2.PdfReader(io.BytesIO(contents))
-    
-    full_text = ""
-    for page in pdf.pages:
-        full_text += page.extract_text()
-    
-    return full_text
+    # 페이지별 추출 진행 상황을 st.status 박스에 표시
+    progress_bar = st.progress(0.0, text=f"📄 {file.name} 텍스트 추출 중...")
+
+    def on_progress(done, total):
+        progress_bar.progress(done / total, text=f"📄 {file.name} 텍스트 추출 중... ({done}/{total} 페이지)")
+
+    # 같은 내용의 파일은 디스크 캐시에서 바로 반환 (SHA-256 기준)
+    pages = extract_pdf_pages(file.read(), on_progress=on_progress)
+    progress_bar.progress(1.0, text=f"📄 {file.name} 텍스트 추출 완료 ({len(pages)} 페이지)")
+    return pages
+
+
+def process_pdf_file(file) -> str:
+    """PDF 파일을 처리하고 텍스트를 추출하는 헬퍼 함수"""
+    return "".join(process_pdf_pages(file))
 
 
 # 로그인 체크 비활성화 (주석 처리)
@@ -171,9 +202,14 @@ with col2:
         accept_multiple_files=True,
         help="여러 개의 파일을 업로드할 수 있습니다."
     )
+    other_files_map_reduce = st.toggle(
+        "파일별로 요약한 뒤 통합하기",
+        value=True,
+        help="각 파일을 개별적으로 동시에 요약한 뒤 하나의 분석으로 통합합니다. 이미 요약한 파일은 다시 요약하지 않습니다."
+    )
 
 
-    def analyze_files(client_file=None, interview_file=None, other_files=None):
+    def analyze_files(client_file=None, interview_file=None, other_files=None, map_reduce=True, use_cache=True):
         logger.info("Received analysis request")
         
         # [DISABLED] AWS DynamoDB 세션 초기화
@@ -189,14 +225,15 @@ with col2:
             "other_files_analysis": None
         }
         
+        # 요약 작업 준비 (세션 상태는 스크립트 스레드에서만 읽음)
+        tasks = {}
+        # 긴 문서의 계층적 요약 통계 (요약 단계 수, 청크 크기 등 튜닝용)
+        summary_stats = {}
+
         # 클라이언트 파일 처리
         if client_file:
-            client_content = process_pdf_file(client_file)
-            # Combine editable prompt with system template
-            client_prompt = CLIENT_REQUIREMENTS_PROMPT["system"].format(
-                text=client_content,
-                analysis_guide=st.session_state["client_prompt"]
-            )
+            client_pages = process_pdf_pages(client_file)
+            client_content = "".join(client_pages)
             
             # [DISABLED] S3 업로드 + DynamoDB 저장: 클라이언트 요구사항 사용자 입력
             # db_manager.insert_chat_data(
@@ -207,26 +244,20 @@ with col2:
             #     context="requirements_analysis"
             # )
 
-            client_analysis = get_chat_completion(client_prompt)
-            results["client_analysis"] = client_analysis
-
-            # [DISABLED] S3 업로드 + DynamoDB 저장: 클라이언트 요구사항 AI 응답
-            # db_manager.insert_chat_data(
-            #     student_id=st.session_state["session_id"],
-            #     timestamp=datetime.now(kst).isoformat(),
-            #     who="agent",
-            #     content=client_analysis,
-            #     context="requirements_analysis"
-            # )
+            # 토큰 예산을 넘는 문서는 청크 단위로 나누어 계층적으로 요약
+            tasks["client_analysis"] = partial(
+                summarize_long_text,
+                client_pages,
+                CLIENT_REQUIREMENTS_PROMPT,
+                st.session_state["client_prompt"],
+                stats=summary_stats.setdefault("client_analysis", {}),
+                use_cache=use_cache,
+            )
         
         # 인터뷰 파일 처리
         if interview_file:
-            interview_content = process_pdf_file(interview_file)
-            # Combine editable prompt with system template
-            interview_prompt = INTERVIEW_PROMPT["system"].format(
-                text=interview_content,
-                analysis_guide=st.session_state["interview_prompt"]
-            )
+            interview_pages = process_pdf_pages(interview_file)
+            interview_content = "".join(interview_pages)
             
             # [DISABLED] S3 업로드 + DynamoDB 저장: 인터뷰 분석 사용자 입력
             # db_manager.insert_chat_data(
@@ -237,30 +268,39 @@ with col2:
             #     context="interview_analysis"
             # )
 
-            interview_analysis = get_chat_completion(interview_prompt)
-            results["interview_analysis"] = interview_analysis
-
-            # [DISABLED] S3 업로드 + DynamoDB 저장: 인터뷰 분석 AI 응답
-            # db_manager.insert_chat_data(
-            #     student_id=st.session_state["session_id"],
-            #     timestamp=datetime.now(kst).isoformat(),
-            #     who="agent",
-            #     content=interview_analysis,
-            #     context="interview_analysis"
-            # )
+            tasks["interview_analysis"] = partial(
+                summarize_long_text,
+                interview_pages,
+                INTERVIEW_PROMPT,
+                st.session_state["interview_prompt"],
+                stats=summary_stats.setdefault("interview_analysis", {}),
+                use_cache=use_cache,
+            )
         
-        # 기타 파일 처리 - 모든 파일 내용을 하나로 합침
+        # 기타 파일 처리
         if other_files:
-            combined_content = ""
-            for file in other_files:
-                file_content = process_pdf_file(file)
-                combined_content += f"\n\n=== {file.name} ===\n{file_content}"
-            
-            # Combine editable prompt with system template
-            other_prompt = RELATED_DOCUMENTS_PROMPT["system"].format(
-                text=combined_content,
-                analysis_guide=st.session_state["other_files_prompt"]
+            documents = [(file.name, process_pdf_file(file)) for file in other_files]
+            combined_content = "".join(
+                f"\n\n=== {name} ===\n{file_content}" for name, file_content in documents
             )
+
+            if map_reduce:
+                # 파일별로 동시에 요약(map)한 뒤 통합(reduce)
+                tasks["other_files_analysis"] = partial(
+                    summarize_documents,
+                    documents,
+                    st.session_state["other_files_prompt"],
+                    cache=st.session_state["other_file_summaries"],
+                    use_cache=use_cache,
+                )
+            else:
+                # 모든 파일 내용을 하나로 합쳐 한 번에 요약
+                # Combine editable prompt with system template
+                other_prompt = RELATED_DOCUMENTS_PROMPT["system"].format(
+                    text=combined_content,
+                    analysis_guide=st.session_state["other_files_prompt"]
+                )
+                tasks["other_files_analysis"] = partial(get_chat_completion, other_prompt, use_cache=use_cache)
             
             # [DISABLED] S3 업로드 + DynamoDB 저장: 기타 파일 분석 사용자 입력
             # db_manager.insert_chat_data(
@@ -271,16 +311,46 @@ with col2:
             #     context="other_files_analysis"
             # )
 
-            combined_analysis = get_chat_completion(other_prompt)
-            results["other_files_analysis"] = combined_analysis
+        # 요약별 결과 영역: 생성되는 토큰을 도착하는 대로 표시
+        placeholders, streamed, last_render = {}, {}, {}
+        for key in tasks:
+            st.markdown(f"**{ANALYSIS_LABELS[key]}**")
+            placeholders[key] = st.empty()
+            placeholders[key].caption("⏳ 요약 중...")
+            streamed[key] = []
+            last_render[key] = 0.0
+
+        # 세 요약 작업을 동시에 실행하고, 스트리밍 이벤트를 받는 대로 화면에 표시
+        for kind, key, value in run_streaming(tasks, max_concurrency=SUMMARY_MAX_CONCURRENCY):
+            if kind == "delta":
+                streamed[key].append(value)
+                # 화면 갱신은 요약별로 초당 STREAM_RENDER_HZ 회 이하로 제한
+                now = time.monotonic()
+                if now - last_render[key] >= 1 / STREAM_RENDER_HZ:
+                    placeholders[key].markdown("".join(streamed[key]) + " ▌")
+                    last_render[key] = now
+                continue
+
+            analysis = value
+            results[key] = analysis
+            placeholders[key].markdown(analysis)
+            st.write(f"✅ {ANALYSIS_LABELS[key]} 완료")
+            stats = summary_stats.get(key)
+            if stats and stats["levels"]:
+                st.caption(
+                    f"긴 문서 계층 요약: 원문 약 {stats['input_tokens']:,} 토큰 → "
+                    f"{stats['levels']}단계, 단계별 청크 수 {[len(level) for level in stats['chunk_tokens']]}, "
+                    f"최대 청크 {max(max(level) for level in stats['chunk_tokens']):,} 토큰"
+                )
 
-            # [DISABLED] S3 업로드 + DynamoDB 저장: 기타 파일 분석 AI 응답
+            # [DISABLED] S3 업로드 + DynamoDB 저장: 요약 결과 AI 응답
+            # (context: requirements_analysis / interview_analysis / other_files_analysis)
             # db_manager.insert_chat_data(
             #     student_id=st.session_state["session_id"],
             #     timestamp=datetime.now(kst).isoformat(),
             #     who="agent",
-            #     content=combined_analysis,
-            #     context="other_files_analysis"
+            #     content=analysis,
+            #     context=ANALYSIS_CONTEXTS[key]
             # )
         
         return results
@@ -288,13 +358,30 @@ with col2:
 
     bt_col1, bt_col2, bt_col3 = st.columns([1, 1, 1])
     with bt_col2:
+        regenerate = st.checkbox(
+            "저장된 요약을 사용하지 않고 새로 생성",
+            value=False,
+            help="같은 문서와 프롬프트로 요약한 적이 있으면 저장된 결과를 바로 사용합니다. 체크하면 새로 요약합니다."
+        )
         button_analyze = st.button(label="📝 Summarize Documents", type="primary", use_container_width=True)
 
     if button_analyze:
         # Check if at least one file is uploaded
         if uploaded_file_client or uploaded_file_interview or (uploaded_files_other and len(uploaded_files_other) > 0):
             with st.status("Processing data...", expanded=True) as status:
-                results = analyze_files(uploaded_file_client, uploaded_file_interview, uploaded_files_other)
+                try:
+                    results = analyze_files(
+                        uploaded_file_client,
+                        uploaded_file_interview,
+                        uploaded_files_other,
+                        map_reduce=other_files_map_reduce,
+                        use_cache=not regenerate,
+                    )
+                except LLMError as e:
+                    status.update(label="❌ Error occurred", state="error")
+                    st.error(f"요약 중 오류가 발생했습니다: {str(e)}")
+                    logger.error(f"Error during summarization: {str(e)}", exc_info=True)
+                    st.stop()
                 status.update(
                     label="Process complete!", state="complete", expanded=False
                 )
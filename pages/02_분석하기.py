@@ -9,6 +9,7 @@ except (ImportError, KeyError):
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+import json
 import logging
 import os
 import pytz
@@ -18,7 +19,8 @@ import streamlit as st
 from datetime import datetime
 
 from src.components.sidebar import render_sidebar
-from src.components.researcher import GapAnalysisCrew, StreamToExpander
+from src.components.jobs import ACTIVE_STATUSES, COMPLETED, FAILED, get_job_manager
+from src.components.researcher import highlight_agent_names, run_gap_analysis
 # [DISABLED] AWS DynamoDB 연동 import
 # DynamoDBManager: 분석 결과를 DynamoDB/S3에 저장하는 클래스 (src/components/db.py 참고)
 # 재활성화 시 아래 주석 해제 및 start_research/reanalyze 블록 내 db_manager 호출 코드 주석 해제 필요
@@ -35,6 +37,20 @@ from src.components.prompts import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 실행 중인 분석 작업 상태를 다시 조회하는 간격 (초)
+JOB_POLL_INTERVAL = 1.0
+# 진행 상황에 표시할 최근 이벤트 수 (이전 이벤트는 생략)
+JOB_MAX_VISIBLE_EVENTS = 30
+JOB_LABELS = {
+    "gap_analysis": "🏗️ **Agents at work...**",
+    "gap_analysis_reanalyzed": "🔄 **Reanalyzing with your input...**",
+}
+# 작업 파라미터에서 복원할 세션 값 (브라우저 재연결 시)
+JOB_SESSION_KEYS = (
+    "client_analysis", "interview_analysis", "other_files_analysis",
+    "performance_prompt", "achievement_prompt", "environment_prompt", "solution_prompt",
+)
+
 
 #--------------------------------#
 #         Streamlit Session State         #
@@ -64,6 +80,110 @@ if "environment_prompt" not in st.session_state:
 if "solution_prompt" not in st.session_state:
     st.session_state["solution_prompt"] = SOLUTION_ANALYSIS_PROMPT["user"]
 
+# 백그라운드 분석 작업 ID (브라우저 재연결로 세션이 새로 만들어지면 URL 의 작업 ID 로 이어서 표시)
+if "analysis_job_id" not in st.session_state:
+    st.session_state["analysis_job_id"] = st.query_params.get("job")
+
+
+#--------------------------------#
+#        Background Analysis     #
+#--------------------------------#
+def start_analysis_job(user_input=None, regenerate=False):
+    """GapAnalysisCrew 를 백그라운드 작업으로 시작 (세션에 진행 중인 작업이 있으면 그 작업을 사용)
+
+    regenerate 이면 저장된 연구원·최종 보고서 결과를 재사용하지 않고 모두 새로 생성합니다.
+    """
+    job_manager = get_job_manager()
+    session_id = st.session_state.get("session_id")
+    active_job = job_manager.active_job(session_id) if session_id else None
+    if active_job:
+        job_id = active_job["id"]
+    else:
+        params = {key: st.session_state[key] for key in JOB_SESSION_KEYS}
+        params.update(user_input=user_input, memory_scope=session_id, reuse_outputs=not regenerate)
+        job_id = job_manager.submit(
+            run_gap_analysis,
+            params,
+            session_id=session_id,
+            kind="gap_analysis_reanalyzed" if user_input else "gap_analysis"
+        )
+    st.session_state["analysis_job_id"] = job_id
+    st.query_params["job"] = job_id
+
+
+def clear_analysis_job():
+    st.session_state["analysis_job_id"] = None
+    st.session_state.pop("analysis_job_events", None)
+    st.query_params.pop("job", None)
+
+
+def fetch_job_events(job_id):
+    """이전 조회 이후 새로 기록된 진행 이벤트만 가져와 세션에 누적 (최근 JOB_MAX_VISIBLE_EVENTS 개만 유지)"""
+    cached = st.session_state.get("analysis_job_events")
+    if not cached or cached["job_id"] != job_id:
+        cached = {"job_id": job_id, "after": 0, "messages": [], "hidden": 0}
+    new_events = get_job_manager().events(job_id, after=cached["after"])
+    if new_events:
+        cached["after"] = new_events[-1][0]
+        messages = cached["messages"] + [message for _, message in new_events]
+        cached["hidden"] += max(0, len(messages) - JOB_MAX_VISIBLE_EVENTS)
+        cached["messages"] = messages[-JOB_MAX_VISIBLE_EVENTS:]
+    st.session_state["analysis_job_events"] = cached
+    return cached
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_analysis_job():
+    """작업 상태를 주기적으로 조회해 진행 상황을 표시하고, 끝나면 결과를 세션에 반영"""
+    job_manager = get_job_manager()
+    job = job_manager.get(st.session_state["analysis_job_id"])
+    if job is None:
+        clear_analysis_job()
+        st.rerun()
+
+    if job["status"] in ACTIVE_STATUSES:
+        label, state = JOB_LABELS.get(job["kind"], JOB_LABELS["gap_analysis"]), "running"
+    elif job["status"] == COMPLETED:
+        label, state = "✅ Analysis completed!", "complete"
+    else:
+        label, state = "❌ Error occurred", "error"
+
+    with st.status(label, state=state, expanded=True):
+        with st.container(height=500, border=False):
+            events = fetch_job_events(job["id"])
+            if events["hidden"]:
+                st.caption(f"이전 진행 상황 {events['hidden']}개 생략")
+            for message in events["messages"]:
+                st.markdown(highlight_agent_names(message))
+
+    if job["status"] == COMPLETED:
+        # 새 세션에서 이어받은 작업이면 분석에 사용한 요약과 프롬프트도 복원
+        params = json.loads(job["params"])
+        for key in JOB_SESSION_KEYS:
+            st.session_state[key] = params[key]
+        st.session_state["analyze_ready"] = True
+        st.session_state["final_report"] = job["result"]
+        st.session_state["is_end"] = True
+
+        # [DISABLED] S3 업로드 + DynamoDB 저장: GapAnalysis 최종/재분석 보고서
+        # db_manager = DynamoDBManager()
+        # kst = pytz.timezone('Asia/Seoul')
+        # timestamp = datetime.now(kst).isoformat()
+        # db_manager.insert_chat_data(
+        #     student_id=st.session_state["session_id"],
+        #     timestamp=timestamp,
+        #     who="agent",
+        #     content=str(job["result"]),
+        #     context=job["kind"]
+        # )
+
+        clear_analysis_job()
+        st.rerun()
+    elif job["status"] == FAILED:
+        st.session_state["analysis_job_error"] = job["error"]
+        clear_analysis_job()
+        st.rerun()
+
 
 #--------------------------------#
 #         Streamlit App          #
@@ -170,59 +290,29 @@ with col2:
     if st.session_state["analyze_ready"]:
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            start_research = st.button("🚀 Start Analysis", use_container_width=True, type="primary")
+            regenerate = st.checkbox(
+                "저장된 분석 결과를 사용하지 않고 다시 생성",
+                value=False,
+                help="입력과 프롬프트가 같은 분석 작업은 저장된 결과를 바로 사용합니다. 체크하면 모든 작업을 새로 실행합니다."
+            )
+            start_research = st.button("🚀 Start Analysis", use_container_width=True, type="primary",
+                                       disabled=bool(st.session_state["analysis_job_id"]))
 
         if start_research:
             if st.session_state["is_end"] and st.session_state["final_report"]:
                 with st.expander(label="✅ Analysis completed!", expanded=False):
                     st.markdown(st.session_state["final_report"])
-            else:
-                with st.status("🏗️ **Agents at work...**", state="running", expanded=True) as status:
-                    try:
-                        # [DISABLED] AWS DynamoDB 세션 초기화 (최초 분석)
-                        # GapAnalysis 시작 시 DynamoDB 매니저 및 KST 타임스탬프 초기화
-                        # db_manager = DynamoDBManager()
-                        # kst = pytz.timezone('Asia/Seoul')
-                        # timestamp = datetime.now(kst).isoformat()
-
-                        with st.container(height=500, border=False):
-                            sys.stdout = StreamToExpander(st)
-                            crew = GapAnalysisCrew(
-                                client_analysis=st.session_state["client_analysis"],
-                                interview_analysis=st.session_state["interview_analysis"],
-                                other_files_analysis=st.session_state["other_files_analysis"],
-                                performance_prompt=st.session_state["performance_prompt"],
-                                achievement_prompt=st.session_state["achievement_prompt"],
-                                environment_prompt=st.session_state["environment_prompt"],
-                                solution_prompt=st.session_state["solution_prompt"],
-                            )
-
-                            final_report = crew.analyze(
-                                st.session_state["client_analysis"],
-                                st.session_state["interview_analysis"],
-                                st.session_state["other_files_analysis"],
-                            )
-
-                            st.session_state["final_report"] = final_report
-
-                            # [DISABLED] S3 업로드 + DynamoDB 저장: GapAnalysis 최종 보고서
-                            # db_manager.insert_chat_data(
-                            #     student_id=st.session_state["session_id"],
-                            #     timestamp=timestamp,
-                            #     who="agent",
-                            #     content=str(final_report),
-                            #     context="gap_analysis"
-                            # )
-
-                        status.update(label="✅ Analysis completed!", state="complete", expanded=False)
-                        st.session_state["is_end"] = True
-
-                    except Exception as e:
-                        status.update(label="❌ Error occurred", state="error")
-                        st.error(f"An error occurred: {str(e)}")
-                        logger.error(f"Error during analysis: {str(e)}", exc_info=True)
-                        st.stop()
-        
+            elif not st.session_state["analysis_job_id"]:
+                start_analysis_job(regenerate=regenerate)
+
+    # 분석은 백그라운드 작업으로 실행되므로, 페이지를 떠났다가 돌아오거나 다시 연결해도 진행 상황을 이어서 표시
+    if st.session_state["analysis_job_id"]:
+        render_analysis_job()
+
+    if error := st.session_state.pop("analysis_job_error", None):
+        st.error(f"An error occurred: {error}")
+
+    if st.session_state["analyze_ready"]:
         # 분석 결과가 있을 때만 결과와 재분석 옵션 표시
         if st.session_state["is_end"] and st.session_state["final_report"]:
             # 결과 표시
@@ -240,59 +330,16 @@ with col2:
 
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
-                reanalyze = st.button("🔄 Re-Analysis", use_container_width=True)
+                reanalyze = st.button("🔄 Re-Analysis", use_container_width=True,
+                                      disabled=bool(st.session_state["analysis_job_id"]))
 
             # 사용자 입력으로 다시 분석하기 버튼이 클릭되었을 때
             if reanalyze:
                 if not user_input:
                     st.error("추가 분석 지시사항을 입력해주세요.")
-                else:
-                    with st.status("🔄 **Reanalyzing with your input...**", state="running", expanded=True) as status:
-                        try:
-                            # [DISABLED] AWS DynamoDB 세션 초기화 (재분석)
-                            # 재분석 시작 시 DynamoDB 매니저 및 KST 타임스탬프 초기화
-                            # db_manager = DynamoDBManager()
-                            # kst = pytz.timezone('Asia/Seoul')
-                            # timestamp = datetime.now(kst).isoformat()
-
-                            with st.container(height=500, border=False):
-                                sys.stdout = StreamToExpander(st)
-                                crew = GapAnalysisCrew(
-                                    client_analysis=st.session_state["client_analysis"],
-                                    interview_analysis=st.session_state["interview_analysis"],
-                                    other_files_analysis=st.session_state["other_files_analysis"],
-                                    user_input=user_input,
-                                    performance_prompt=st.session_state["performance_prompt"],
-                                    achievement_prompt=st.session_state["achievement_prompt"],
-                                    environment_prompt=st.session_state["environment_prompt"],
-                                    solution_prompt=st.session_state["solution_prompt"],
-                                )
-                                
-                                # 사용자 입력을 추가 파라미터로 전달
-                                final_report = crew.analyze(
-                                    st.session_state["client_analysis"],
-                                    st.session_state["interview_analysis"],
-                                    st.session_state["other_files_analysis"],
-                                    user_input=user_input
-                                )
-                                
-                                st.session_state["final_report"] = final_report
-
-                                # [DISABLED] S3 업로드 + DynamoDB 저장: GapAnalysis 재분석 보고서
-                                # db_manager.insert_chat_data(
-                                #     student_id=st.session_state["session_id"],
-                                #     timestamp=timestamp,
-                                #     who="agent",
-                                #     content=str(final_report),
-                                #     context="gap_analysis_reanalyzed"
-                                # )
-
-                            status.update(label="✅ Reanalysis completed!", state="complete", expanded=True)
-
-                        except Exception as e:
-                            status.update(label="❌ Error occurred", state="error")
-                            st.error(f"An error occurred: {str(e)}")
-                            st.stop()
+                elif not st.session_state["analysis_job_id"]:
+                    start_analysis_job(user_input=user_input, regenerate=regenerate)
+                    st.rerun()
 
     # 다음 단계로 버튼
     mov_col1, mov_col2, mov_col3 = st.columns([1, 1, 1])
@@ -6,24 +6,12 @@ try:
 except (ImportError, KeyError):
     pass
 
-import pypandoc
 import os
 import streamlit as st
 
-@st.cache_resource
-def ensure_pandoc():
-    try:
-        pypandoc.get_pandoc_version()
-    except OSError:
-        pypandoc.download_pandoc()
-        os.environ["PYPANDOC_PANDOC"] = pypandoc.get_pandoc_path()
-
-ensure_pandoc()
-
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-import tempfile
 import logging
 import pytz
 import sys
@@ -32,6 +20,7 @@ import streamlit as st
 from datetime import datetime
 
 from src.components.sidebar import render_sidebar
+from src.utils.export import EXPORT_FORMATS, available_formats, get_export_cache
 
 
 # 로깅 설정
@@ -39,16 +28,80 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def convert_md_to_docx(md_text):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmpfile:
-        pypandoc.convert_text(md_text, "docx", format="md", outputfile=tmpfile.name)
-        tmpfile_path = tmpfile.name
-
-    # Read the DOCX file into memory
-    with open(tmpfile_path, "rb") as docx_file:
-        docx_data = docx_file.read()
-
-    return docx_data
+# 내보내기 파일이 준비되었는지 다시 확인하는 간격 (초)
+EXPORT_POLL_INTERVAL = 0.5
+
+
+def _render_export_buttons(result_text):
+    """형식별 만들기·다운로드 버튼을 그리고, 아직 만드는 중인 파일이 있는지 반환"""
+    export_cache = get_export_cache()
+    pending = False
+    for fmt in available_formats():
+        label, extension, mime, _ = EXPORT_FORMATS[fmt]
+        future = export_cache.get(result_text, fmt)
+        failed = future is not None and future.done() and future.exception() is not None
+
+        prepare_col, download_col = st.columns([1, 1])
+        with prepare_col:
+            if future is None or failed:
+                if st.button(f"{label} 파일 만들기", key=f"export_{fmt}", use_container_width=True):
+                    future = export_cache.request(result_text, fmt)
+                    failed = False
+            elif not future.done():
+                st.button(f"{label} 파일 만드는 중...", key=f"export_{fmt}", disabled=True, use_container_width=True)
+            else:
+                st.button(f"{label} 파일 준비됨", key=f"export_{fmt}", disabled=True, use_container_width=True)
+
+        ready = future is not None and future.done() and not failed
+        with download_col:
+            st.download_button(
+                label=f"{label} 파일로 다운로드",
+                data=future.result() if ready else b"",
+                file_name=f"research_report.{extension}",
+                mime=mime,
+                key=f"download_{fmt}",
+                disabled=not ready,
+                use_container_width=True,
+            )
+        if failed:
+            logger.error(f"Report export ({fmt}) failed: {future.exception()}")
+            st.error(f"{label} 파일을 만들지 못했습니다: {future.exception()}")
+        pending = pending or (future is not None and not future.done())
+
+    return pending
+
+
+def _has_pending_exports(result_text):
+    export_cache = get_export_cache()
+    futures = (export_cache.get(result_text, fmt) for fmt in available_formats())
+    return any(future is not None and not future.done() for future in futures)
+
+
+@st.fragment
+def _export_downloads(result_text):
+    # 변환을 시작하면 전체를 다시 실행하여 주기적으로 확인하는 영역으로 전환
+    if _render_export_buttons(result_text):
+        st.rerun()
+
+
+@st.fragment(run_every=EXPORT_POLL_INTERVAL)
+def _poll_export_downloads(result_text):
+    # 모든 변환이 끝나면 전체를 다시 실행하여 주기적 확인을 멈춤
+    if not _render_export_buttons(result_text):
+        st.rerun()
+
+
+def render_export_downloads(result_text):
+    """형식별 내보내기 버튼
+
+    사용자가 형식을 고르면 백그라운드에서 변환을 시작하고, 만드는 중인 파일이 있는 동안에만
+    이 영역을 EXPORT_POLL_INTERVAL 초마다 다시 그립니다. 다운로드 버튼은 파일이 준비된 뒤에만
+    활성화됩니다. 변환 결과는 보고서 해시별로 캐시되므로 페이지를 다시 열어도 바로 받을 수 있습니다.
+    """
+    if _has_pending_exports(result_text):
+        _poll_export_downloads(result_text)
+    else:
+        _export_downloads(result_text)
 
 
 #--------------------------------#
@@ -137,10 +190,7 @@ with col2:
     st.subheader("최종 수행 문제 분석 보고서")
     # Convert CrewOutput to string for display and download
     result_text = str(st.session_state["final_report"])
-    
-    # Convert Markdown to DOCX
-    docx_data = convert_md_to_docx(result_text)
-    
+
     with st.container(height=500):
         # Display the final result
         if result_text and result_text != 'None':
@@ -148,29 +198,12 @@ with col2:
 
     if st.session_state["final_report"]:
 
-            # Create download buttons
+            # Create download buttons (형식을 고르면 그때 백그라운드에서 변환)
             st.divider()
             download_col1, download_col2, download_col3 = st.columns([1, 2, 1])
             with download_col2:
                 st.markdown("### 📥 Download Research Report")
-
-                # Download as DOCX
-                st.download_button(
-                    label="MS Word 파일로 다운로드",
-                    data=docx_data,
-                    file_name="research_report.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    help="Download the research report in Word format",
-                )
-
-                # Download as Markdown
-                st.download_button(
-                    label="Markdown 파일로 다운로드",
-                    data=result_text,
-                    file_name="research_report.md",
-                    mime="text/markdown",
-                    help="Download the research report in Markdown format"
-                )
+                render_export_downloads(result_text)
 
 
     # # 다음 단계로 버튼
@@ -0,0 +1,101 @@
+import fcntl
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from crewai.memory import EntityMemory, LongTermMemory, ShortTermMemory
+
+logger = logging.getLogger(__name__)
+
+# crew 메모리 설정 (환경변수로 조정 가능)
+# - off: 메모리 사용 안 함 (임베딩 호출과 ChromaDB 저장 없음)
+# - ephemeral: 실행마다 임시 디렉터리에 저장하고 실행이 끝나면 삭제
+# - persistent: 세션별 디렉터리에 저장하고, 오래되었거나 용량을 넘은 세션부터 삭제
+MEMORY_MODES = ("off", "ephemeral", "persistent")
+CREW_MEMORY_MODE = os.environ.get("CREW_MEMORY_MODE", "ephemeral")
+CREW_MEMORY_DIR = Path(os.environ.get("CREW_MEMORY_DIR", ".cache/crew_memory"))
+CREW_MEMORY_MAX_BYTES = int(os.environ.get("CREW_MEMORY_MAX_BYTES", str(500 * 1024 * 1024)))
+CREW_MEMORY_MAX_AGE = int(os.environ.get("CREW_MEMORY_MAX_AGE", str(3 * 24 * 60 * 60)))  # 초 단위, 기본 3일
+
+
+def _memory_config(path: Path) -> dict:
+    """path 아래에 단기·장기·엔티티 메모리를 모두 저장하는 Crew 키워드 인자"""
+    return {
+        "memory": True,
+        "short_term_memory": ShortTermMemory(path=str(path)),
+        "long_term_memory": LongTermMemory(path=str(path / "long_term_memory_storage.db")),
+        "entity_memory": EntityMemory(path=str(path)),
+    }
+
+
+def _dir_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+def _lock_path(path: Path) -> Path:
+    """메모리 디렉터리의 사용 중 표시용 잠금 파일 (디렉터리를 삭제해도 남겨 둠)"""
+    lock_dir = CREW_MEMORY_DIR / ".locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    return lock_dir / f"{path.name}.lock"
+
+
+def evict_memory_dirs():
+    """세션별 메모리 디렉터리 중 CREW_MEMORY_MAX_AGE 보다 오래된 것을 삭제하고,
+    전체 용량이 CREW_MEMORY_MAX_BYTES 를 넘으면 가장 오래 사용되지 않은 것부터 삭제
+
+    실행 중인 crew 가 사용하는 디렉터리(다른 작업 프로세스 포함)는 잠금 파일로 확인하여 삭제하지 않습니다.
+    """
+    if not CREW_MEMORY_DIR.exists():
+        return
+    expires_before = time.time() - CREW_MEMORY_MAX_AGE
+    entries = []
+    for path in CREW_MEMORY_DIR.iterdir():
+        if not path.is_dir() or path.name.startswith("."):
+            continue
+        entries.append((path.stat().st_mtime, _dir_size(path), path))
+
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if mtime >= expires_before and total <= CREW_MEMORY_MAX_BYTES:
+            break
+        with open(_lock_path(path), "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # 실행 중인 crew 가 사용 중
+            shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        logger.info(f"Crew memory evicted {path.name} ({size:,} bytes)")
+
+
+@contextmanager
+def crew_memory(mode=None, scope=None):
+    """crew 실행 동안 사용할 메모리 설정을 Crew 키워드 인자 dict 로 제공
+
+    Args:
+        mode (str): "off" | "ephemeral" | "persistent" (기본값: CREW_MEMORY_MODE)
+        scope (str): persistent 모드에서 저장소를 나눌 단위 (예: 세션 ID)
+    """
+    mode = mode or CREW_MEMORY_MODE
+    if mode not in MEMORY_MODES:
+        raise ValueError(f"Unknown crew memory mode: {mode} (expected one of {MEMORY_MODES})")
+
+    if mode == "off":
+        yield {"memory": False}
+    elif mode == "ephemeral":
+        with tempfile.TemporaryDirectory(prefix="crew_memory_") as path:
+            yield _memory_config(Path(path))
+    else:
+        path = CREW_MEMORY_DIR / re.sub(r"[^A-Za-z0-9_-]", "_", scope or "default")
+        # 실행하는 동안 공유 잠금을 유지하여 다른 실행의 삭제 대상에서 제외
+        with open(_lock_path(path), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            path.mkdir(parents=True, exist_ok=True)
+            os.utime(path)  # 최근 사용 시각 갱신 (삭제 순서 기준)
+            evict_memory_dirs()
+            yield _memory_config(path)
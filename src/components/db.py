@@ -1,127 +1,572 @@
 # =============================================================================
-# [DISABLED] AWS DynamoDB & S3 연동 모듈
+# 채팅(분석) 데이터 저장 모듈
 # -----------------------------------------------------------------------------
-# 이 파일의 모든 코드는 현재 비활성화(주석 처리)되어 있습니다.
-#
 # 기능 개요:
-#   - DynamoDBManager 클래스: AWS DynamoDB 및 S3에 채팅 데이터를 저장/조회하는 매니저
-#   - S3 업로드: 분석 텍스트 콘텐츠를 S3 버킷에 UUID 기반 파일명으로 업로드
-#   - DynamoDB 저장: student_id + timestamp를 복합 키로 채팅 데이터(메타 + S3 URL) 저장
-#   - DynamoDB 조회: student_id + timestamp로 저장된 채팅 데이터 조회
+#   - DynamoDBManager 클래스: 채팅 데이터를 저장/조회하는 매니저 (저장소는 교체 가능)
+#   - 저장소(DB_BACKEND 환경변수로 선택)
+#       local: SQLite(메타데이터) + 파일(콘텐츠 본문), AWS 없이 동작 (기본값)
+#       aws:   DynamoDB(메타데이터) + S3(콘텐츠 본문, 로컬 읽기 캐시 사용)
+#   - list_chat_history(): 세션별 이력을 최신순 cursor 페이지 단위로 조회 (context 필터 지원)
+#   - 콘텐츠 본문은 내용 해시로 이름 붙여 zstd(없으면 gzip)로 압축 저장하며,
+#     같은 내용은 한 번만 저장/업로드
+#   - 쓰기는 백그라운드 write-behind 대기열에 넣고 바로 반환하며, 대기열이
+#     DB_BATCH_SIZE 개가 되거나 DB_FLUSH_INTERVAL 초가 지나면 한 번에 저장
 #
-# 재활성화 방법:
+# AWS 저장소 사용 방법:
 #   1. .streamlit/secrets.toml 에 AWS 자격증명 및 리소스 이름 설정
 #      (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION_NAME,
 #       DYNAMODB_TABLE_NAME, S3_BUCKET_NAME)
-#   2. 이 파일의 모든 주석(#)을 제거하여 코드 활성화
-#   3. pages/01_요약하기.py, pages/02_분석하기.py 에서
-#      DynamoDBManager import 및 호출 코드 주석 해제
+#      context 필터 이력 조회에는 GSI(DB_HISTORY_INDEX, PK student_id / SK context_ts) 필요
+#   2. DB_BACKEND=aws 환경변수 설정 (boto3 설치 필요)
+#
+# 페이지 연동: pages/01_요약하기.py, pages/02_분석하기.py 의 [DISABLED]
+# DynamoDBManager import 및 호출 코드 주석 해제
 # =============================================================================
 
-# import boto3
-# from botocore.exceptions import NoCredentialsError, PartialCredentialsError
-# import uuid
-# import streamlit as st
-# from pathlib import Path
-# from datetime import datetime
-# import pytz
-
-# class DynamoDBManager:
-#     def __init__(self):
-#         # .streamlit/secrets.toml 에서 AWS 자격증명 로드 후 클라이언트 초기화
-#         self._load_aws_credentials()
-#         self._initialize_aws_clients()
-#         self.kst = pytz.timezone('Asia/Seoul')
-
-#     def _load_aws_credentials(self):
-#         """secrets.toml 에서 AWS 자격증명 및 리소스 이름 로드"""
-#         try:
-#             self.aws_access_key_id = st.secrets["AWS_ACCESS_KEY_ID"]
-#             self.aws_secret_access_key = st.secrets["AWS_SECRET_ACCESS_KEY"]
-#             self.aws_region_name = st.secrets["AWS_REGION_NAME"]
-#             self.dynamodb_table_name = st.secrets["DYNAMODB_TABLE_NAME"]
-#             self.s3_bucket_name = st.secrets["S3_BUCKET_NAME"]
-#         except Exception as e:
-#             raise Exception(f"Failed to load AWS credentials: {str(e)}")
-
-#     def _initialize_aws_clients(self):
-#         """AWS DynamoDB resource 및 S3 client 초기화"""
-#         try:
-#             # DynamoDB resource 생성 (테이블 수준 ORM 인터페이스 제공)
-#             self.dynamodb = boto3.resource(
-#                 "dynamodb",
-#                 aws_access_key_id=self.aws_access_key_id,
-#                 aws_secret_access_key=self.aws_secret_access_key,
-#                 region_name=self.aws_region_name
-#             )
-#             # S3 client 생성 (객체 업로드/다운로드용 저수준 인터페이스)
-#             self.s3 = boto3.client(
-#                 's3',
-#                 aws_access_key_id=self.aws_access_key_id,
-#                 aws_secret_access_key=self.aws_secret_access_key,
-#                 region_name=self.aws_region_name
-#             )
-#             self.table = self.dynamodb.Table(self.dynamodb_table_name)
-#         except (NoCredentialsError, PartialCredentialsError) as e:
-#             raise Exception(f"AWS credentials error: {str(e)}")
-
-#     def upload_to_s3(self, content, content_type="text/plain"):
-#         """텍스트 콘텐츠를 S3에 업로드하고 s3:// URL 반환
-#
-#         대용량 텍스트를 DynamoDB item 크기 제한(400KB) 우회를 위해
-#         S3에 별도 저장하고, DynamoDB에는 URL만 기록하는 패턴 사용
-#         """
-#         try:
-#             file_key = f"contents/{uuid.uuid4()}.txt"  # UUID로 고유 파일명 생성
-#             self.s3.put_object(
-#                 Bucket=self.s3_bucket_name,
-#                 Key=file_key,
-#                 Body=content.encode('utf-8'),
-#                 ContentType=content_type
-#             )
-#             return f"s3://{self.s3_bucket_name}/{file_key}"
-#         except Exception as e:
-#             raise Exception(f"S3 upload error: {str(e)}")
-
-#     def insert_chat_data(self, student_id, timestamp, who, content, context):
-#         """채팅 데이터를 DynamoDB에 저장 (콘텐츠 본문은 S3에 업로드 후 URL 저장)
-#
-#         DynamoDB 스키마:
-#           PK: student_id (str)
-#           SK: timestamp (ISO 8601, KST)
-#           data.who: "user" | "agent"
-#           data.content: s3:// URL (실제 텍스트는 S3에 저장)
-#           data.context: 분석 컨텍스트 식별자
-#         """
-#         try:
-#             # timestamp가 KST(+09:00)가 아닌 경우 현재 KST 시각으로 교체
-#             if not timestamp.endswith('+09:00'):
-#                 timestamp = datetime.now(self.kst).isoformat()
-#             content_url = self.upload_to_s3(content)
-#             response = self.table.put_item(
-#                 Item={
-#                     "student_id": student_id,
-#                     "timestamp": timestamp,
-#                     "data": {
-#                         "who": who,
-#                         "content": content_url,
-#                         "context": context
-#                     }
-#                 }
-#             )
-#             return response
-#         except Exception as e:
-#             raise Exception(f"Failed to insert chat data: {str(e)}")
-
-#     def get_chat_data(self, student_id, timestamp):
-#         """DynamoDB에서 student_id + timestamp 복합 키로 채팅 데이터 조회"""
-#         try:
-#             response = self.table.get_item(
-#                 Key={
-#                     "student_id": student_id,
-#                     "timestamp": timestamp
-#                 }
-#             )
-#             return response.get("Item")
-#         except Exception as e:
-#             raise Exception(f"Failed to get chat data: {str(e)}")
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import pytz
+import streamlit as st
+
+try:
+    import zstandard
+except ImportError:  # zstandard 가 없으면 표준 라이브러리 gzip 으로 압축
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 저장소 설정 (환경변수로 조정 가능)
+DB_BACKEND = os.environ.get("DB_BACKEND", "local")
+DB_LOCAL_PATH = os.environ.get("DB_LOCAL_PATH", ".cache/chat_data.sqlite3")
+DB_LOCAL_CONTENT_DIR = os.environ.get("DB_LOCAL_CONTENT_DIR", ".cache/chat_contents")
+# write-behind 배치 크기(DynamoDB batch write 한도 25)와 최대 대기 시간(초), 실패 시 재시도 횟수
+DB_BATCH_SIZE = int(os.environ.get("DB_BATCH_SIZE", "25"))
+DB_FLUSH_INTERVAL = float(os.environ.get("DB_FLUSH_INTERVAL", "2.0"))
+DB_WRITE_RETRIES = int(os.environ.get("DB_WRITE_RETRIES", "3"))
+# 콘텐츠 본문 압축 방식("zstd" | "gzip")과 원격 저장소 본문의 로컬 읽기 캐시
+DB_BLOB_CODEC = os.environ.get("DB_BLOB_CODEC", "zstd" if zstandard else "gzip")
+DB_BLOB_CACHE_DIR = Path(os.environ.get("DB_BLOB_CACHE_DIR", ".cache/chat_blobs"))
+DB_BLOB_CACHE_MAX_BYTES = int(os.environ.get("DB_BLOB_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+# 이력 조회 한 페이지의 기본 항목 수와 DynamoDB 이력 조회용 GSI 이름
+DB_HISTORY_PAGE_SIZE = int(os.environ.get("DB_HISTORY_PAGE_SIZE", "20"))
+DB_HISTORY_INDEX = os.environ.get("DB_HISTORY_INDEX", "student_id-context_ts-index")
+
+BLOB_SUFFIXES = {"zstd": ".txt.zst", "gzip": ".txt.gz"}
+
+
+#--------------------------------#
+#         Content Blobs          #
+#--------------------------------#
+def encode_blob(content, codec=None):
+    """콘텐츠 본문을 압축하고 내용 해시로 이름을 붙임
+
+    같은 내용은 항상 같은 이름이 되므로, 이미 저장된 본문은 다시 올리지 않습니다.
+
+    Returns:
+        tuple: (blob 이름 "{sha256}.txt.zst|gz", 압축된 bytes)
+    """
+    codec = codec or DB_BLOB_CODEC
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("DB_BLOB_CODEC=zstd requires the zstandard package")
+        body = zstandard.ZstdCompressor(level=10).compress(data)
+    elif codec == "gzip":
+        body = gzip.compress(data, mtime=0)  # mtime 고정: 같은 내용이면 같은 bytes
+    else:
+        raise ValueError(f"Unknown DB_BLOB_CODEC: {codec} (expected 'zstd' or 'gzip')")
+    return f"{digest}{BLOB_SUFFIXES[codec]}", body
+
+
+def decode_blob(name, body):
+    """blob 이름의 확장자에 맞게 압축을 풀어 텍스트로 반환 (이전 uuid .txt 본문도 지원)"""
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"Reading {name} requires the zstandard package")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif name.endswith(".gz"):
+        body = gzip.decompress(body)
+    return body.decode("utf-8")
+
+
+class BlobCache:
+    """원격 저장소에서 받은 blob 을 로컬 디스크에 보관하는 읽기 캐시
+
+    blob 은 이름(내용 해시)이 바뀌지 않는 한 내용도 바뀌지 않으므로 무효화가 필요 없고,
+    전체 용량이 max_bytes 를 넘으면 가장 오래 사용되지 않은 것부터 삭제합니다.
+    """
+
+    def __init__(self, directory=DB_BLOB_CACHE_DIR, max_bytes=DB_BLOB_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file())
+
+    def get(self, name):
+        path = self.directory / name
+        try:
+            body = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # 최근 사용 시각 갱신
+        return body
+
+    def put(self, name, body):
+        path = self.directory / name
+        if path.exists():
+            return
+        tmp_path = path.with_name(f".{name}.{uuid.uuid4().hex}")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += len(body)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (stat.st_mtime, stat.st_size, path)
+            for path in self.directory.iterdir() if path.is_file()
+            for stat in (path.stat(),)
+        )
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes * 0.8:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+
+
+def encode_cursor(key):
+    """저장소가 돌려준 다음 페이지 시작 위치를 URL 에 넣을 수 있는 문자열로 변환"""
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError(f"Invalid history cursor: {cursor!r}")
+
+
+#--------------------------------#
+#         Local Backend          #
+#--------------------------------#
+class LocalChatStore:
+    """SQLite 에 채팅 메타데이터를, 파일에 콘텐츠 본문을 저장하는 로컬 저장소
+
+    DynamoDB 스키마와 같은 복합 키(student_id + timestamp)를 사용하며, 같은 키로
+    다시 저장하면 put_item 처럼 덮어씁니다.
+    """
+
+    def __init__(self, path=DB_LOCAL_PATH, content_dir=DB_LOCAL_CONTENT_DIR):
+        self.content_dir = Path(content_dir)
+        self.content_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chat_data ("
+            "student_id TEXT NOT NULL, timestamp TEXT NOT NULL, who TEXT NOT NULL, "
+            "content TEXT NOT NULL, context TEXT, PRIMARY KEY (student_id, timestamp))"
+        )
+        # context 별 이력 조회용 (context 없는 조회는 기본 키 순서를 사용)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS chat_data_context ON chat_data (student_id, context, timestamp)"
+        )
+        self._conn.commit()
+
+    def upload_content(self, content):
+        """콘텐츠 본문을 압축 파일로 저장하고 file:// URL 반환 (같은 내용은 한 번만 저장)"""
+        name, body = encode_blob(content)
+        path = self.content_dir / name
+        if not path.exists():
+            tmp_path = path.with_name(f".{name}.{uuid.uuid4().hex}")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+        return path.resolve().as_uri()
+
+    def read_content(self, url):
+        """upload_content 가 반환한 file:// URL 의 본문을 텍스트로 반환"""
+        path = Path(unquote(urlparse(url).path))
+        return decode_blob(path.name, path.read_bytes())
+
+    def write_batch(self, items):
+        rows = [
+            (item["student_id"], item["timestamp"], item["who"], self.upload_content(item["content"]), item["context"])
+            for item in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chat_data (student_id, timestamp, who, content, context) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def get_item(self, student_id, timestamp):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT who, content, context FROM chat_data WHERE student_id = ? AND timestamp = ?",
+                (student_id, timestamp)
+            ).fetchone()
+        if row is None:
+            return None
+        who, content_url, context = row
+        return {
+            "student_id": student_id,
+            "timestamp": timestamp,
+            "data": {"who": who, "content": content_url, "context": context}
+        }
+
+    def list_items(self, student_id, context=None, limit=DB_HISTORY_PAGE_SIZE, start_key=None):
+        """student_id 의 항목을 최신순으로 limit 개 조회
+
+        Returns:
+            tuple: (항목 list, 다음 페이지 시작 위치 또는 None)
+        """
+        query = "SELECT timestamp, who, content, context FROM chat_data WHERE student_id = ?"
+        args = [student_id]
+        if context is not None:
+            query += " AND context = ?"
+            args.append(context)
+        if start_key is not None:
+            query += " AND timestamp < ?"
+            args.append(start_key["timestamp"])
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        args.append(limit + 1)  # 한 개 더 읽어 다음 페이지가 있는지 확인
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+
+        items = [
+            {
+                "student_id": student_id,
+                "timestamp": timestamp,
+                "data": {"who": who, "content": content_url, "context": row_context}
+            }
+            for timestamp, who, content_url, row_context in rows[:limit]
+        ]
+        next_key = {"timestamp": items[-1]["timestamp"]} if len(rows) > limit else None
+        return items, next_key
+
+
+#--------------------------------#
+#          AWS Backend           #
+#--------------------------------#
+class AWSChatStore:
+    """DynamoDB 에 채팅 메타데이터를, S3 에 콘텐츠 본문을 저장하는 저장소
+
+    DynamoDB 스키마:
+      PK: student_id (str)
+      SK: timestamp (ISO 8601, KST)
+      data.who: "user" | "agent"
+      data.content: s3:// URL (실제 텍스트는 S3에 내용 해시 키로 압축 저장)
+      data.context: 분석 컨텍스트 식별자
+      context_ts: "{context}#{timestamp}" (GSI DB_HISTORY_INDEX 의 정렬 키)
+    """
+
+    def __init__(self):
+        # .streamlit/secrets.toml 에서 AWS 자격증명 로드 후 클라이언트 초기화
+        self._load_aws_credentials()
+        self._initialize_aws_clients()
+        self.cache = BlobCache()
+        self._uploaded = set()  # 이 프로세스에서 이미 올렸거나 있음을 확인한 blob 이름
+
+    def _load_aws_credentials(self):
+        """secrets.toml 에서 AWS 자격증명 및 리소스 이름 로드"""
+        try:
+            self.aws_access_key_id = st.secrets["AWS_ACCESS_KEY_ID"]
+            self.aws_secret_access_key = st.secrets["AWS_SECRET_ACCESS_KEY"]
+            self.aws_region_name = st.secrets["AWS_REGION_NAME"]
+            self.dynamodb_table_name = st.secrets["DYNAMODB_TABLE_NAME"]
+            self.s3_bucket_name = st.secrets["S3_BUCKET_NAME"]
+        except Exception as e:
+            raise Exception(f"Failed to load AWS credentials: {str(e)}")
+
+    def _initialize_aws_clients(self):
+        """AWS DynamoDB resource 및 S3 client 초기화 (boto3 는 AWS 저장소에서만 필요)"""
+        import boto3
+        from botocore.exceptions import NoCredentialsError, PartialCredentialsError
+
+        try:
+            # DynamoDB resource 생성 (테이블 수준 ORM 인터페이스 제공)
+            self.dynamodb = boto3.resource(
+                "dynamodb",
+                aws_access_key_id=self.aws_access_key_id,
+                aws_secret_access_key=self.aws_secret_access_key,
+                region_name=self.aws_region_name
+            )
+            # S3 client 생성 (객체 업로드/다운로드용 저수준 인터페이스)
+            self.s3 = boto3.client(
+                's3',
+                aws_access_key_id=self.aws_access_key_id,
+                aws_secret_access_key=self.aws_secret_access_key,
+                region_name=self.aws_region_name
+            )
+            self.table = self.dynamodb.Table(self.dynamodb_table_name)
+        except (NoCredentialsError, PartialCredentialsError) as e:
+            raise Exception(f"AWS credentials error: {str(e)}")
+
+    def upload_content(self, content):
+        """텍스트 콘텐츠를 압축해 S3에 업로드하고 s3:// URL 반환
+
+        대용량 텍스트를 DynamoDB item 크기 제한(400KB) 우회를 위해
+        S3에 별도 저장하고, DynamoDB에는 URL만 기록하는 패턴 사용.
+        키는 내용 해시(contents/{sha256}.txt.zst|gz)이므로 이미 있는 본문은 다시 올리지 않습니다.
+        """
+        from botocore.exceptions import ClientError
+
+        name, body = encode_blob(content)
+        file_key = f"contents/{name}"
+        url = f"s3://{self.s3_bucket_name}/{file_key}"
+        if name in self._uploaded:
+            return url
+        try:
+            self.s3.head_object(Bucket=self.s3_bucket_name, Key=file_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise Exception(f"S3 upload error: {str(e)}")
+            try:
+                self.s3.put_object(
+                    Bucket=self.s3_bucket_name,
+                    Key=file_key,
+                    Body=body,
+                    ContentType="text/plain; charset=utf-8",
+                    Metadata={"codec": DB_BLOB_CODEC}
+                )
+            except Exception as e:
+                raise Exception(f"S3 upload error: {str(e)}")
+            self.cache.put(name, body)
+        self._uploaded.add(name)
+        return url
+
+    def read_content(self, url):
+        """s3:// URL 의 본문을 텍스트로 반환 (로컬 캐시에 없을 때만 S3 에서 다운로드)"""
+        parsed = urlparse(url)
+        file_key = parsed.path.lstrip("/")
+        name = file_key.rsplit("/", 1)[-1]
+        body = self.cache.get(name)
+        if body is None:
+            body = self.s3.get_object(Bucket=parsed.netloc, Key=file_key)["Body"].read()
+            self.cache.put(name, body)
+        return decode_blob(name, body)
+
+    def write_batch(self, items):
+        """본문을 S3 에 올린 뒤 메타데이터를 batch_writer 로 한 번에 저장"""
+        with self.table.batch_writer(overwrite_by_pkeys=["student_id", "timestamp"]) as batch:
+            for item in items:
+                batch.put_item(
+                    Item={
+                        "student_id": item["student_id"],
+                        "timestamp": item["timestamp"],
+                        # 이력 조회 GSI 정렬 키: context 로 거른 뒤 시간순 정렬
+                        "context_ts": f"{item['context']}#{item['timestamp']}",
+                        "data": {
+                            "who": item["who"],
+                            "content": self.upload_content(item["content"]),
+                            "context": item["context"]
+                        }
+                    }
+                )
+
+    def get_item(self, student_id, timestamp):
+        response = self.table.get_item(
+            Key={
+                "student_id": student_id,
+                "timestamp": timestamp
+            }
+        )
+        return response.get("Item")
+
+    def list_items(self, student_id, context=None, limit=DB_HISTORY_PAGE_SIZE, start_key=None):
+        """student_id 의 항목을 최신순으로 limit 개 조회
+
+        context 가 없으면 테이블의 기본 키(student_id + timestamp)로, 있으면
+        DB_HISTORY_INDEX GSI(student_id + context_ts)로 Query 하며 Scan 은 사용하지 않습니다.
+
+        Returns:
+            tuple: (항목 list, 다음 페이지 시작 위치(LastEvaluatedKey) 또는 None)
+        """
+        from boto3.dynamodb.conditions import Key
+
+        condition = Key("student_id").eq(student_id)
+        kwargs = {"ScanIndexForward": False, "Limit": limit}
+        if context is not None:
+            condition &= Key("context_ts").begins_with(f"{context}#")
+            kwargs["IndexName"] = DB_HISTORY_INDEX
+        if start_key is not None:
+            kwargs["ExclusiveStartKey"] = start_key
+        response = self.table.query(KeyConditionExpression=condition, **kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+
+
+#--------------------------------#
+#      Write-behind Queue        #
+#--------------------------------#
+class WriteBehindQueue:
+    """저장 요청을 받아 바로 반환하고, 백그라운드 스레드가 모아서 저장소에 한 번에 기록
+
+    대기 중인 항목이 batch_size 개가 되거나 첫 항목이 들어온 뒤 flush_interval 초가
+    지나면 store.write_batch() 로 기록합니다. 기록에 실패하면 DB_WRITE_RETRIES 번까지
+    다시 시도하고, 그래도 실패한 배치는 로그를 남기고 버립니다.
+    """
+
+    def __init__(self, store, batch_size=DB_BATCH_SIZE, flush_interval=DB_FLUSH_INTERVAL):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def flush(self, timeout=None):
+        """지금까지 넣은 항목이 모두 기록될 때까지 대기"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _run(self):
+        batch, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                self._write(batch)
+                batch, deadline = [], None
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch, deadline = [], None
+
+    def _write(self, batch):
+        if not batch:
+            return
+        for attempt in range(1, DB_WRITE_RETRIES + 1):
+            try:
+                started_at = time.perf_counter()
+                self.store.write_batch(batch)
+                logger.info(f"Stored {len(batch)} chat item(s) in {(time.perf_counter() - started_at) * 1000:.0f}ms")
+                return
+            except Exception:
+                logger.warning(f"Chat data write failed (attempt {attempt}/{DB_WRITE_RETRIES})", exc_info=True)
+                time.sleep(min(2 ** attempt, 10))
+        logger.error(f"Dropped {len(batch)} chat item(s) after {DB_WRITE_RETRIES} failed attempts")
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(backend=None) -> WriteBehindQueue:
+    """저장소 종류별로 프로세스 전체에서 공유하는 write-behind 대기열"""
+    backend = backend or DB_BACKEND
+    with _writers_lock:
+        if backend not in _writers:
+            if backend == "local":
+                store = LocalChatStore()
+            elif backend == "aws":
+                store = AWSChatStore()
+            else:
+                raise ValueError(f"Unknown DB_BACKEND: {backend} (expected 'local' or 'aws')")
+            _writers[backend] = WriteBehindQueue(store)
+            # 서버 종료 시 대기 중인 항목 기록
+            atexit.register(_writers[backend].flush, 10)
+    return _writers[backend]
+
+
+#--------------------------------#
+#          DB Manager            #
+#--------------------------------#
+class DynamoDBManager:
+    def __init__(self, backend=None):
+        # 저장소와 write-behind 대기열은 프로세스 전체에서 공유 (매 실행마다 새로 연결하지 않음)
+        self._writer = get_writer(backend)
+        self.store = self._writer.store
+        self.kst = pytz.timezone('Asia/Seoul')
+
+    def insert_chat_data(self, student_id, timestamp, who, content, context):
+        """채팅 데이터 저장 요청 (기록은 백그라운드에서 배치로 처리되며 바로 반환)
+
+        Returns:
+            dict: 저장될 항목 (student_id, timestamp, who, content, context)
+        """
+        # timestamp가 KST(+09:00)가 아닌 경우 현재 KST 시각으로 교체
+        if not timestamp.endswith('+09:00'):
+            timestamp = datetime.now(self.kst).isoformat()
+        item = {
+            "student_id": student_id,
+            "timestamp": timestamp,
+            "who": who,
+            "content": content,
+            "context": context
+        }
+        self._writer.put(item)
+        return item
+
+    def flush(self, timeout=None):
+        """대기 중인 저장 요청이 모두 기록될 때까지 대기"""
+        return self._writer.flush(timeout)
+
+    def read_content(self, url):
+        """get_chat_data 결과의 data.content URL 이 가리키는 본문 텍스트 반환"""
+        return self.store.read_content(url)
+
+    def list_chat_history(self, student_id, context=None, limit=DB_HISTORY_PAGE_SIZE, cursor=None):
+        """student_id 의 채팅 이력을 최신순으로 페이지 단위 조회 (대기 중인 저장 요청을 먼저 기록)
+
+        Args:
+            student_id (str): 세션(사용자) ID
+            context (str): 이 context 의 항목만 조회 (예: "requirements_analysis", "gap_analysis")
+            limit (int): 한 페이지의 최대 항목 수
+            cursor (str): 이전 호출이 반환한 next_cursor (첫 페이지는 None)
+
+        Returns:
+            dict: {"items": 항목 list, "next_cursor": 다음 페이지 cursor 또는 None}
+        """
+        try:
+            self.flush()
+            items, next_key = self.store.list_items(student_id, context, limit, decode_cursor(cursor))
+            return {"items": items, "next_cursor": encode_cursor(next_key)}
+        except Exception as e:
+            raise Exception(f"Failed to list chat history: {str(e)}")
+
+    def get_chat_data(self, student_id, timestamp):
+        """student_id + timestamp 복합 키로 채팅 데이터 조회 (대기 중인 저장 요청을 먼저 기록)"""
+        try:
+            self.flush()
+            return self.store.get_item(student_id, timestamp)
+        except Exception as e:
+            raise Exception(f"Failed to get chat data: {str(e)}")
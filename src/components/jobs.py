@@ -0,0 +1,220 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import workers
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 작업 설정 (환경변수로 조정 가능)
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", ".cache/jobs.sqlite3")
+JOB_MAX_WORKERS = int(os.environ.get("JOB_MAX_WORKERS", "2"))
+# process: 작업 프로세스 풀에서 실행 (시간·메모리 제한, 비정상 종료 시 재시작)
+# thread: 서버 프로세스의 스레드에서 실행 (제한 없음, 로컬 개발용)
+JOB_BACKEND = os.environ.get("JOB_BACKEND", "process")
+JOB_RETENTION = int(os.environ.get("JOB_RETENTION", str(24 * 60 * 60)))  # 초 단위, 기본 1일
+
+# 작업 상태
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+_ACTIVE_PLACEHOLDERS = ", ".join("?" * len(ACTIVE_STATUSES))
+
+
+#--------------------------------#
+#           Job Store            #
+#--------------------------------#
+class JobStore:
+    """작업 상태·진행 이벤트·결과를 저장하는 SQLite 저장소
+
+    Streamlit 스크립트 실행(rerun)이나 브라우저 연결과 무관하게 유지되므로,
+    페이지는 작업 ID 로 상태만 조회하면 됩니다.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, session_id TEXT, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "params TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session_id, created_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "job_id TEXT NOT NULL, seq INTEGER NOT NULL, message TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (job_id, seq))"
+        )
+        self._conn.commit()
+
+    def create(self, session_id, kind, params) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, session_id, kind, status, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, session_id, kind, QUEUED, json.dumps(params, ensure_ascii=False), now, now)
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def add_event(self, job_id, message):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO job_events (job_id, seq, message, created_at) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM job_events WHERE job_id = ?",
+                (job_id, message, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def get(self, job_id):
+        """작업 정보를 dict 로 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def events(self, job_id, after=0) -> list:
+        """seq 가 after 보다 큰 진행 이벤트를 (seq, message) 목록으로 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, message FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        return [(row["seq"], row["message"]) for row in rows]
+
+    def active_job(self, session_id, kind=None):
+        """세션에서 아직 끝나지 않은 가장 최근 작업 (없으면 None)"""
+        query = f"SELECT * FROM jobs WHERE session_id = ? AND status IN ({_ACTIVE_PLACEHOLDERS})"
+        args = [session_id, *ACTIVE_STATUSES]
+        if kind:
+            query += " AND kind = ?"
+            args.append(kind)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY created_at DESC LIMIT 1", args).fetchone()
+        return dict(row) if row else None
+
+    def fail_unfinished(self, error):
+        """이전 서버 프로세스에서 끝나지 않은 작업을 실패로 표시"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN ({_ACTIVE_PLACEHOLDERS})",
+                (FAILED, error, time.time(), *ACTIVE_STATUSES)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def purge(self, older_than):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE updated_at < ?)", (older_than,)
+            )
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (older_than,))
+            self._conn.commit()
+
+
+#--------------------------------#
+#          Job Manager           #
+#--------------------------------#
+class JobManager:
+    """작업을 백그라운드 워커에서 실행하고 상태를 JobStore 에 기록
+
+    작업 함수는 fn(params, progress) 형태로 호출됩니다. params 는 JSON 으로 저장 가능한
+    dict 이고, progress(message) 로 남긴 메시지는 진행 이벤트로 저장됩니다. 반환값(str)은
+    작업 결과로, 예외는 작업 오류로 저장됩니다. process 백엔드에서는 fn 이 작업 프로세스로
+    전달되므로 모듈 최상위 함수여야 합니다.
+    """
+
+    def __init__(self, store=None, max_workers=JOB_MAX_WORKERS, backend=JOB_BACKEND):
+        self.store = store or JobStore()
+        if backend == "process":
+            self._pool = workers.WorkerPool(max_workers, self._on_worker_message)
+            self._executor = None
+        else:
+            self._pool = None
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew-job")
+        interrupted = self.store.fail_unfinished("서버가 재시작되어 작업이 중단되었습니다.")
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted job(s) as failed")
+
+    def submit(self, fn, params, session_id=None, kind=None) -> str:
+        """작업을 대기열에 넣고 작업 ID 를 반환"""
+        self.store.purge(time.time() - JOB_RETENTION)
+        job_id = self.store.create(session_id, kind or fn.__name__, params)
+        if self._pool:
+            self._pool.submit(job_id, fn, params)
+        else:
+            self._executor.submit(self._run, job_id, fn, params)
+        logger.info(f"Job {job_id} ({kind or fn.__name__}) queued for session {session_id}")
+        return job_id
+
+    def _run(self, job_id, fn, params):
+        self.store.update(job_id, RUNNING)
+        started_at = time.perf_counter()
+        try:
+            result = fn(params, lambda message: self.store.add_event(job_id, message))
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e!r}", exc_info=True)
+            self.store.update(job_id, FAILED, error=str(e) or repr(e))
+            return
+        self.store.update(job_id, COMPLETED, result=result)
+        logger.info(f"Job {job_id} completed in {time.perf_counter() - started_at:.1f}s")
+
+    def _on_worker_message(self, kind, job_id, payload):
+        """작업 프로세스에서 온 메시지를 JobStore 에 기록 (감독 스레드에서 호출)"""
+        if kind == workers.STARTED:
+            self.store.update(job_id, RUNNING)
+        elif kind == workers.EVENT:
+            self.store.add_event(job_id, payload)
+        elif kind == workers.COMPLETED:
+            self.store.update(job_id, COMPLETED, result=payload)
+            logger.info(f"Job {job_id} completed")
+        elif kind == workers.FAILED:
+            self.store.update(job_id, FAILED, error=payload)
+            logger.error(f"Job {job_id} failed: {payload}")
+
+    def shutdown(self):
+        if self._pool:
+            self._pool.shutdown()
+        else:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def events(self, job_id, after=0):
+        return self.store.events(job_id, after)
+
+    def active_job(self, session_id, kind=None):
+        return self.store.active_job(session_id, kind)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Streamlit 서버 프로세스 전체에서 공유하는 작업 관리자"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+            atexit.register(_manager.shutdown)
+    return _manager
@@ -1,26 +1,370 @@
+import asyncio
+import logging
 import os
-from openai import OpenAI
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from .llm_cache import ResponseCache, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+# 동시에 보낼 수 있는 최대 요청 수 (환경변수로 조정 가능)
+# - MAX_CONCURRENCY: 한 번의 일괄 요청(get_chat_completions) 안에서의 동시 요청 수
+# - MAX_IN_FLIGHT: 모든 세션을 합친 프로세스 전체의 동시 요청 수 (요청 한도 초과 시 자동으로 줄어듦)
+MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "3"))
+MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", "16"))
+MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", str(MAX_IN_FLIGHT)))
+
+# 재시도 설정: 지수 백오프(지터 포함), 서버가 알려준 대기 시간이 있으면 우선 사용
+MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "5"))
+RETRY_BASE_DELAY = float(os.environ.get("LLM_RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.environ.get("LLM_RETRY_MAX_DELAY", "60.0"))
+
+
+#--------------------------------#
+#          LLM Errors            #
+#--------------------------------#
+class LLMError(Exception):
+    """LLM 요청 실패 (재시도 후에도 실패한 경우 포함)"""
+
+
+class LLMRateLimitError(LLMError):
+    """요청 한도 초과(429)가 재시도 후에도 계속되거나, 사용량 한도(quota)를 모두 소진함"""
+
+
+class LLMUnavailableError(LLMError):
+    """연결 실패, 시간 초과, 서버 오류(5xx)가 재시도 후에도 계속됨"""
+
+
+class LLMRequestError(LLMError):
+    """재시도해도 성공할 수 없는 요청 오류 (잘못된 요청, 인증 실패 등)"""
+
+
+def _classify_error(error):
+    """(재시도 가능 여부, 요청 한도 초과 여부)"""
+    if isinstance(error, openai.RateLimitError):
+        # 사용량 한도 소진은 기다려도 풀리지 않음
+        return getattr(error, "code", None) != "insufficient_quota", True
+    if isinstance(error, openai.APIConnectionError):  # APITimeoutError 포함
+        return True, False
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409) or error.status_code >= 500, False
+    return False, False
+
+
+def _to_llm_error(error) -> LLMError:
+    retryable, throttled = _classify_error(error)
+    if throttled:
+        return LLMRateLimitError(f"LLM rate limit exceeded: {error}")
+    if retryable:
+        return LLMUnavailableError(f"LLM service unavailable: {error}")
+    return LLMRequestError(f"LLM request failed: {error}")
+
+
+def _parse_reset_duration(value: str):
+    """x-ratelimit-reset-* 헤더 값("1s", "6m0s", "20ms")을 초 단위로 변환"""
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    matches = re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value)
+    if not matches:
+        return None
+    return sum(float(amount) * units[unit] for amount, unit in matches)
+
+
+def _server_retry_delay(error):
+    """응답 헤더(Retry-After, retry-after-ms, x-ratelimit-reset-*)가 알려준 대기 시간 (초)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    if "retry-after" in headers:
+        value = headers["retry-after"]
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    # 남은 요청/토큰 수가 0인 한도의 초기화 시각까지 대기
+    delays = []
+    for kind in ("requests", "tokens"):
+        if headers.get(f"x-ratelimit-remaining-{kind}") == "0" and f"x-ratelimit-reset-{kind}" in headers:
+            delay = _parse_reset_duration(headers[f"x-ratelimit-reset-{kind}"])
+            if delay is not None:
+                delays.append(delay)
+    return max(delays) if delays else None
+
+
+def _retry_delay(error, attempt: int) -> float:
+    server_delay = _server_retry_delay(error)
+    if server_delay is not None:
+        # 여러 요청이 같은 시각에 몰리지 않도록 약간의 지터 추가
+        return min(RETRY_MAX_DELAY, server_delay + random.uniform(0, RETRY_BASE_DELAY))
+    # Full jitter 지수 백오프
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+#--------------------------------#
+#   Adaptive Concurrency Limit   #
+#--------------------------------#
+class AdaptiveLimiter:
+    """AIMD 방식의 동시 요청 제한
+
+    요청이 성공할 때마다 한도를 조금씩 늘리고(additive increase, 한도당 +1/limit),
+    요청 한도 초과(429)를 받으면 한도를 절반으로 줄입니다(multiplicative decrease).
+    한 번에 몰려 온 429 응답으로 한도가 연속해서 줄어들지 않도록 감소 후
+    decrease_cooldown 초 동안은 다시 줄이지 않습니다.
+    """
+
+    def __init__(self, max_limit, min_limit=1, decrease_cooldown=1.0):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.decrease_cooldown = decrease_cooldown
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record_success(self):
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def record_throttle(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
+        logger.warning(f"LLM rate limited, concurrency limit reduced to {int(self.limit)}")
+
+
+#--------------------------------#
+#     Shared Async LLM Client    #
+#--------------------------------#
+class _AsyncLLMRuntime:
+    """프로세스 전체에서 공유하는 이벤트 루프, OpenAI 비동기 클라이언트, 동시 요청 제한
+
+    이벤트 루프는 별도의 데몬 스레드에서 계속 실행되며, 모든 세션의 요청이 같은
+    루프와 같은 HTTP 연결 풀을 사용합니다. 루프를 한 곳에 고정해야 httpx 연결을
+    요청마다 새로 열지 않고 재사용할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-event-loop", daemon=True)
+        self._thread.start()
+        self.limiter = AdaptiveLimiter(MAX_IN_FLIGHT)
+        # 환경변수에서 직접 API 키 읽기 (재시도는 aget_chat_completion 에서 직접 처리)
+        self.client = AsyncOpenAI(
+            api_key=os.environ['OPENAI_API_KEY'],
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+            ),
+        )
+
+    def submit(self, coro):
+        """코루틴을 공유 루프에 제출하고 concurrent.futures.Future 를 반환"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> _AsyncLLMRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = _AsyncLLMRuntime()
+    return _runtime
+
+
+async def aget_chat_completion(
+    user_prompt,
+    system_message="You are a helpful assistant.",
+    model_name="gpt-4o-mini",
+    use_cache=True,
+    on_delta=None,
+    ):
+    """OpenAI 채팅 완성 요청 (비동기)
+
+    같은 모델·시스템 메시지·사용자 프롬프트의 응답은 캐시에서 바로 반환합니다.
+    use_cache=False 이면 캐시를 건너뛰고 새로 생성한 응답으로 캐시를 갱신합니다.
+    on_delta 를 넘기면 스트리밍으로 요청하고, 토큰 조각이 도착할 때마다
+    on_delta(조각)를 호출합니다 (캐시 적중 시에는 전체 응답으로 한 번 호출).
+    공유 루프(get_runtime().loop)에서 실행되어야 합니다.
+
+    Raises:
+        LLMError: 재시도 후에도 요청이 실패한 경우 (LLMRateLimitError, LLMUnavailableError,
+            LLMRequestError 중 하나)
+    """
+    cache = get_response_cache()
+    cache_key = ResponseCache.make_key(model_name, system_message, user_prompt)
+    if cache is not None and use_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"LLM response cache hit {cache_key[:12]}")
+            if on_delta:
+                on_delta(cached)
+            return cached
+
+    runtime = get_runtime()
+    messages = [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": user_prompt}
+    ]
+    for attempt in range(MAX_RETRIES + 1):
+        parts = []
+        try:
+            async with runtime.limiter:
+                if on_delta:
+                    stream = await runtime.client.chat.completions.create(
+                        model=model_name,
+                        messages=messages,
+                        stream=True
+                    )
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            on_delta(delta)
+                    response = "".join(parts)
+                else:
+                    completion = await runtime.client.chat.completions.create(
+                        model=model_name,
+                        messages=messages
+                    )
+                    response = completion.choices[0].message.content
+            runtime.limiter.record_success()
+            break
+
+        except Exception as e:
+            retryable, throttled = _classify_error(e)
+            if throttled:
+                runtime.limiter.record_throttle()
+            # 이미 화면에 전달한 스트리밍 조각이 있으면 중복되지 않도록 재시도하지 않음
+            if not retryable or parts or attempt == MAX_RETRIES:
+                raise _to_llm_error(e) from e
+            delay = _retry_delay(e, attempt)
+            logger.warning(
+                f"LLM request failed ({type(e).__name__}), retrying in {delay:.1f}s "
+                f"({attempt + 1}/{MAX_RETRIES})"
+            )
+            await asyncio.sleep(delay)
+
+    if cache is not None:
+        cache.set(cache_key, response)
+    return response
 
-# 환경변수에서 직접 API 키 읽기
-client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
 
 def get_chat_completion(
-    user_prompt, 
+    user_prompt,
     system_message="You are a helpful assistant.",
     model_name="gpt-4o-mini",
+    use_cache=True,
+    on_delta=None,
     ):
+    """aget_chat_completion 의 동기 래퍼 (공유 루프에서 실행하고 결과를 기다림)
+
+    on_delta 는 공유 루프 스레드에서 호출되므로 Streamlit 요소를 직접 그리지 말고
+    큐 등에 넘겨 스크립트 스레드에서 처리해야 합니다 (run_streaming 참고).
+    """
+    coro = aget_chat_completion(user_prompt, system_message, model_name, use_cache, on_delta)
+    return get_runtime().submit(coro).result()
+
+
+def run_streaming(tasks, max_concurrency=None):
+    """on_delta 를 받는 작업들을 동시에 실행하고, 스트리밍 이벤트를 도착 순서대로 반환
+
+    Args:
+        tasks (dict): 결과 식별용 key -> on_delta 키워드 인자를 받는 callable
+        max_concurrency (int): 동시에 실행할 최대 작업 수 (기본값: MAX_CONCURRENCY)
+
+    Yields:
+        tuple: ("delta", key, 토큰 조각) 또는 ("done", key, 최종 결과)
+
+    Note:
+        이벤트는 이 제너레이터를 순회하는 스레드(스크립트 스레드)로 전달되므로
+        화면 갱신을 그대로 처리할 수 있습니다. 작업이 예외를 던지면 다시 발생시킵니다.
+    """
+    if not tasks:
+        return
+    events = queue.Queue()
+
+    def _run(key, task):
+        try:
+            result = task(on_delta=lambda delta: events.put(("delta", key, delta)))
+            events.put(("done", key, result))
+        except Exception as e:
+            events.put(("error", key, e))
+
+    max_workers = max(1, min(max_concurrency or MAX_CONCURRENCY, len(tasks)))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
     try:
-        completion = client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
+        for key, task in tasks.items():
+            executor.submit(_run, key, task)
+        remaining = len(tasks)
+        while remaining:
+            kind, key, value = events.get()
+            if kind == "error":
+                raise value
+            if kind == "done":
+                remaining -= 1
+            yield kind, key, value
+    finally:
+        # 오류가 났거나 순회를 중단(rerun 등)한 경우 시작 전 작업은 취소하고, 실행 중인 작업을 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_chat_completions(prompts, max_concurrency=None, **kwargs):
+    """여러 프롬프트를 공유 루프에서 동시에 요청하고, 완료되는 순서대로 (key, response)를 반환
+
+    Args:
+        prompts (dict): 결과 식별용 key -> user_prompt
+        max_concurrency (int): 이 일괄 요청의 최대 동시 요청 수 (기본값: MAX_CONCURRENCY).
+            프로세스 전체 제한(MAX_IN_FLIGHT)은 별도로 항상 적용됩니다.
+        **kwargs: aget_chat_completion 에 그대로 전달할 인자 (system_message, model_name, use_cache)
+    """
+    if not prompts:
+        return
+    runtime = get_runtime()
+    batch_limit = asyncio.Semaphore(max_concurrency or MAX_CONCURRENCY)
+
+    async def _limited(prompt):
+        async with batch_limit:
+            return await aget_chat_completion(prompt, **kwargs)
 
-        response = completion.choices[0].message.content
-        print(response)
-        return response
-        
-    except Exception as e:
-        return f"Error occurred: {str(e)}"  
\ No newline at end of file
+    futures = {runtime.submit(_limited(prompt)): key for key, prompt in prompts.items()}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 응답 캐시 설정 (환경변수로 조정 가능)
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", ".cache/llm_responses.sqlite3")
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 60 * 60)))  # 초 단위, 기본 7일
+LLM_CACHE_MEMORY_ITEMS = int(os.environ.get("LLM_CACHE_MEMORY_ITEMS", "256"))
+
+
+#--------------------------------#
+#      LLM Response Cache        #
+#--------------------------------#
+class ResponseCache:
+    """(모델, 시스템 메시지, 사용자 프롬프트) 기준 LLM 응답 캐시
+
+    1단계: 프로세스 메모리의 LRU (최대 memory_items 개)
+    2단계: SQLite 파일 (서버 재시작 후에도 유지)
+    두 단계 모두 ttl 초가 지난 응답은 만료된 것으로 보고 사용하지 않습니다.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, memory_items=LLM_CACHE_MEMORY_ITEMS):
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self._memory = OrderedDict()  # key -> (created_at, response)
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name, system_message, user_prompt) -> str:
+        payload = json.dumps([model_name, system_message, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key, created_at, response):
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """캐시된 응답을 반환 (없거나 만료되었으면 None)"""
+        expires_before = time.time() - self.ttl
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] >= expires_before:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ? AND created_at >= ?",
+                (key, expires_before)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            self._remember(key, created_at, response)
+            return response
+
+    def set(self, key, response):
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, response)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, created_at)
+            )
+            # 만료된 응답은 쓰기 시점에 함께 정리
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (created_at - self.ttl,))
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """프로세스 전체에서 공유하는 응답 캐시 (LLM_CACHE_ENABLED=0 이면 None)"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
@@ -36,6 +36,25 @@ RELATED_DOCUMENTS_PROMPT = {
     "system": "{analysis_guide}\n\n분석할 텍스트:\n{text}"
 }
 
+RELATED_DOCUMENTS_MERGE_PROMPT = {
+    "user": """다음 텍스트는 여러 문서를 각각 분석한 부분 요약입니다. 부분 요약들을 하나의 통합 분석으로 정리해주세요:
+
+1. 문서들의 공통 목적과 전체 맥락
+2. 문서별 핵심 내용의 통합 요약
+3. 문서 간 연관성, 중복 또는 상충되는 내용
+4. 추가 분석이 필요한 부분
+
+문서 이름을 근거로 명시하여 명확하고 구체적으로 정리해주세요.""",
+    "system": "{analysis_guide}\n\n원래 분석 지침:\n{original_guide}\n\n문서별 부분 요약:\n{text}"
+}
+
+CHUNK_SUMMARY_PROMPT = {
+    "user": """다음 텍스트는 긴 문서를 나눈 일부분({part}/{total})입니다. 이후 아래 분석 지침에 따라 문서 전체를 분석할 수 있도록,
+지침과 관련된 사실, 수치, 인용, 고유명사를 빠짐없이 보존하여 간결하게 요약해주세요.
+분석이나 해석은 추가하지 말고 원문의 내용만 정리해주세요.""",
+    "system": "{analysis_guide}\n\n최종 분석 지침:\n{original_guide}\n\n요약할 텍스트:\n{text}"
+}
+
 PERFORMANCE_ANALYSIS_PROMPT = {
     "user": """수행공학 관점에서 다음 수행문제를 분석하세요:
 
@@ -1,6 +1,9 @@
 from textwrap import dedent
 from crewai import Agent, Task, Crew, Process, LLM
+from crewai.tasks.task_output import TaskOutput
 
+from .crew_memory import CREW_MEMORY_MODE, crew_memory
+from .llm_cache import ResponseCache
 from .prompts import (
     PERFORMANCE_ANALYSIS_PROMPT,
     ACHIEVEMENT_ANALYSIS_PROMPT,
@@ -8,27 +11,86 @@ from .prompts import (
     SOLUTION_ANALYSIS_PROMPT
 )
 
+import functools
+import os
 import re
-import streamlit as st
+import time
 import logging
 
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
+logger = logging.getLogger(__name__)
+
+# 4개 연구원 작업을 동시에 실행할지 여부 (벤치마크용으로 0 으로 두면 기존처럼 순차 실행)
+CREW_PARALLEL_RESEARCH = os.environ.get("CREW_PARALLEL_RESEARCH", "1") == "1"
+
+# 작업 결과 저장소: 설명(입력 + 프롬프트)이 같은 작업은 재분석 시 다시 실행하지 않음
+CREW_TASK_CACHE_PATH = os.environ.get("CREW_TASK_CACHE_PATH", ".cache/crew_tasks.sqlite3")
+
+_task_cache = None
+
+
+# 세 요약을 한 번만 담는 공유 맥락 블록과, 작업 설명에서 이를 가리키는 문구
+SHARED_CONTEXT_TITLE = "공유 분석 맥락"
+SHARED_CONTEXT_REFERENCE = f"함께 제공되는 '{SHARED_CONTEXT_TITLE}'의 클라이언트 요구사항, 인터뷰 분석 결과, 기타 파일 분석 결과를 참고하세요."
+
+# 진행 상황에서 에이전트 이름마다 고정으로 사용할 색
+AGENT_NAMES = ("프로젝트 매니저", "수행 분석 연구원", "성과 분석 연구원", "환경 분석 연구원", "원인 및 해결방안 연구원")
+AGENT_COLORS = dict(zip(AGENT_NAMES, ['red', 'green', 'blue', 'orange', 'violet']))
+_AGENT_NAME_PATTERN = re.compile("|".join(re.escape(name) for name in AGENT_NAMES))
+
+
+@functools.lru_cache(maxsize=None)
+def get_llm(model, temperature=None, top_p=None, max_tokens=None, reasoning_effort=None) -> LLM:
+    """설정별로 한 번만 생성하여 프로세스 전체(모든 세션)에서 공유하는 LLM 클라이언트"""
+    return LLM(
+        model=model,
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+        reasoning_effort=reasoning_effort,
+    )
+
+
+def _memoized_agent(factory):
+    """GapAnalysisCrew 인스턴스마다 에이전트를 한 번만 생성
+
+    crewAI 는 실행 중에 에이전트에 crew 참조 등 실행 상태를 기록하므로, 동시에
+    실행될 수 있는 다른 세션의 crew 와는 에이전트를 공유하지 않습니다.
+    """
+    @functools.wraps(factory)
+    def wrapper(self):
+        agents = self.__dict__.setdefault("_agents", {})
+        if factory.__name__ not in agents:
+            agents[factory.__name__] = factory(self)
+        return agents[factory.__name__]
+    return wrapper
+
+
+def get_task_cache() -> ResponseCache:
+    """프로세스 전체에서 공유하는 crew 작업 결과 저장소"""
+    global _task_cache
+    if _task_cache is None:
+        _task_cache = ResponseCache(path=CREW_TASK_CACHE_PATH)
+    return _task_cache
+
+
 class GapAnalysisCrew:
     ###
     ## LLM Settings
     ###
     def __init__(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None,
                  performance_prompt=None, achievement_prompt=None, environment_prompt=None,
-                 solution_prompt=None):
-        self.general_llm = LLM(
+                 solution_prompt=None, parallel_research=None, reuse_outputs=True,
+                 memory_mode=None, memory_scope=None, on_event=None):
+        self.general_llm = get_llm(
                 model="openai/gpt-4.1-mini",
                 temperature=0.1,
                 top_p=0.9,
                 max_tokens=2048
             )
-        self.manager_llm = LLM(
+        self.manager_llm = get_llm(
                 #TODO  model="openai/gpt-4.1-2025-04-14",
                 ##TODO gpt-4.1 플래그십 모델로 바꾸기
                 model="openai/gpt-4.1",
@@ -46,9 +108,24 @@ class GapAnalysisCrew:
 
         self.user_input = user_input
 
+        # 연구원 작업은 서로의 결과를 사용하지 않으므로 동시에 실행하고, 최종 보고서 작업만 모두를 기다림
+        self.parallel_research = CREW_PARALLEL_RESEARCH if parallel_research is None else parallel_research
+        # 입력이 바뀌지 않은 작업은 저장된 결과를 재사용 (재분석 시 보통 최종 보고서만 다시 실행),
+        # False 이면 모든 작업을 새로 실행하고 그 결과로 저장소를 갱신
+        self.reuse_outputs = reuse_outputs
+        self._shared_contexts = {}
+        # crew 메모리: "off" | "ephemeral" | "persistent" (기본값: CREW_MEMORY_MODE), persistent 는 memory_scope(세션) 단위로 저장
+        self.memory_mode = memory_mode
+        self.memory_scope = memory_scope
+        # 진행 이벤트 콜백: 실행마다 따로 전달받아 단계·작업 완료 메시지(markdown)를 보냄 (sys.stdout 은 사용하지 않음)
+        self.on_event = on_event
+        # 마지막 실행의 토큰 사용량 (crewAI UsageMetrics, 실행하지 않았으면 None)
+        self.last_usage = None
+
     ###
     ## Agents Settings
     ###
+    @_memoized_agent
     def pm(self) -> Agent:
         return Agent(
             role="프로젝트 매니저",
@@ -87,6 +164,7 @@ class GapAnalysisCrew:
             llm=self.manager_llm,
         )
 
+    @_memoized_agent
     def performance_researcher(self) -> Agent:
         return Agent(
             role="수행 분석 연구원",
@@ -110,6 +188,7 @@ class GapAnalysisCrew:
             llm=self.general_llm
         )
 
+    @_memoized_agent
     def achievement_researcher(self) -> Agent:
         return Agent(
             role="성과 분석 연구원",
@@ -133,6 +212,7 @@ class GapAnalysisCrew:
             llm=self.general_llm
         )
 
+    @_memoized_agent
     def environment_researcher(self) -> Agent:
         return Agent(
             role="환경 분석 연구원",
@@ -156,6 +236,7 @@ class GapAnalysisCrew:
             llm=self.general_llm
         )
 
+    @_memoized_agent
     def solution_researcher(self) -> Agent:
         return Agent(
             role="원인 및 해결방안 연구원",
@@ -184,12 +265,37 @@ class GapAnalysisCrew:
     ###
     ## Tasks Settings
     ###
+    def shared_context(self, client_analysis, interview_analysis, other_files_analysis=None) -> Task:
+        """모든 작업이 함께 참고하는 요약 맥락
+
+        실행되지 않는 맥락 전용 작업으로, 결과(output)에 세 요약을 한 번만 담아 두고
+        각 작업의 context 로 연결합니다. 같은 요약에 대해서는 같은 객체를 재사용합니다.
+        각 에이전트의 LLM 호출은 서로 독립적이므로 요약은 작업마다 한 번씩 전달되며,
+        작업 설명(메모리에 저장되는 항목)에는 요약 원문이 들어가지 않습니다.
+        토큰 비교는 test/shared_context_benchmark.py 참고.
+        """
+        key = (client_analysis, interview_analysis, other_files_analysis)
+        if key not in self._shared_contexts:
+            task = Task(
+                description=SHARED_CONTEXT_TITLE,
+                expected_output="클라이언트 요구사항, 인터뷰 분석 결과, 기타 파일 분석 결과"
+            )
+            task.output = TaskOutput(
+                description=task.description,
+                raw="\n".join([
+                    f"[{SHARED_CONTEXT_TITLE}]",
+                    f"> 클라이언트 요구사항: {client_analysis}",
+                    f"> 인터뷰 분석 결과: {interview_analysis}",
+                    f"> 기타 파일 분석 결과: {other_files_analysis if other_files_analysis else '없음'}",
+                ]),
+                agent="사용자 제공 자료"
+            )
+            self._shared_contexts[key] = task
+        return self._shared_contexts[key]
+
     def analyze_performance(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None) -> Task:
-        text_content = f"""
-                > 클라이언트 요구사항: {client_analysis}
-                > 인터뷰 분석 결과: {interview_analysis}
-                > 기타 파일 분석 결과: {other_files_analysis if other_files_analysis else "없음"}
-                """
+        # 요약 원문은 공유 맥락 작업의 결과로 연결하고 설명에는 참조만 남김 (작업 프롬프트에는 맥락으로 포함됨)
+        text_content = SHARED_CONTEXT_REFERENCE
         formatted_prompt = PERFORMANCE_ANALYSIS_PROMPT["system"].format(
             text=text_content,
             analysis_guide=self.performance_prompt
@@ -200,15 +306,14 @@ class GapAnalysisCrew:
             ** > 사용자 추가 수정 요청사항: {user_input} **
         """),
             agent=self.performance_researcher(),
-            expected_output="수행 관련 차이점 분석 보고서"
+            expected_output="수행 관련 차이점 분석 보고서",
+            async_execution=self.parallel_research,
+            context=[self.shared_context(client_analysis, interview_analysis, other_files_analysis)]
         )
 
     def analyze_achievement(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None) -> Task:
-        text_content = f"""
-                > 클라이언트 요구사항: {client_analysis}
-                > 인터뷰 분석 결과: {interview_analysis}
-                > 기타 파일 분석 결과: {other_files_analysis if other_files_analysis else "없음"}
-                """
+        # 요약 원문은 공유 맥락 작업의 결과로 연결하고 설명에는 참조만 남김 (작업 프롬프트에는 맥락으로 포함됨)
+        text_content = SHARED_CONTEXT_REFERENCE
         formatted_prompt = ACHIEVEMENT_ANALYSIS_PROMPT["system"].format(
             text=text_content,
             analysis_guide=self.achievement_prompt
@@ -219,15 +324,14 @@ class GapAnalysisCrew:
             ** > 사용자 추가 수정 요청사항: {user_input} **
         """),
             agent=self.achievement_researcher(),
-            expected_output="성과 관련 차이점 분석 보고서"
+            expected_output="성과 관련 차이점 분석 보고서",
+            async_execution=self.parallel_research,
+            context=[self.shared_context(client_analysis, interview_analysis, other_files_analysis)]
         )
 
     def analyze_environment(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None) -> Task:
-        text_content = f"""
-                > 클라이언트 요구사항: {client_analysis}
-                > 인터뷰 분석 결과: {interview_analysis}
-                > 기타 파일 분석 결과: {other_files_analysis if other_files_analysis else "없음"}
-                """
+        # 요약 원문은 공유 맥락 작업의 결과로 연결하고 설명에는 참조만 남김 (작업 프롬프트에는 맥락으로 포함됨)
+        text_content = SHARED_CONTEXT_REFERENCE
         formatted_prompt = ENVIRONMENT_ANALYSIS_PROMPT["system"].format(
             text=text_content,
             analysis_guide=self.environment_prompt
@@ -238,15 +342,14 @@ class GapAnalysisCrew:
             ** > 사용자 추가 수정 요청사항: {user_input} **
         """),
             agent=self.environment_researcher(),
-            expected_output="환경 관련 차이점 분석 보고서"
+            expected_output="환경 관련 차이점 분석 보고서",
+            async_execution=self.parallel_research,
+            context=[self.shared_context(client_analysis, interview_analysis, other_files_analysis)]
         )
 
     def analyze_solution(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None) -> Task:
-        text_content = f"""
-                > 클라이언트 요구사항: {client_analysis}
-                > 인터뷰 분석 결과: {interview_analysis}
-                > 기타 파일 분석 결과: {other_files_analysis if other_files_analysis else "없음"}
-                """
+        # 요약 원문은 공유 맥락 작업의 결과로 연결하고 설명에는 참조만 남김 (작업 프롬프트에는 맥락으로 포함됨)
+        text_content = SHARED_CONTEXT_REFERENCE
         formatted_prompt = SOLUTION_ANALYSIS_PROMPT["system"].format(
             text=text_content,
             analysis_guide=self.solution_prompt
@@ -257,10 +360,13 @@ class GapAnalysisCrew:
             ** > 사용자 추가 수정 요청사항: {user_input} **
         """),
             agent=self.solution_researcher(),
-            expected_output="원인 및 해결방안 보고서"
+            expected_output="원인 및 해결방안 보고서",
+            async_execution=self.parallel_research,
+            context=[self.shared_context(client_analysis, interview_analysis, other_files_analysis)]
         )
 
-    def compile_final_report(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None) -> Task:
+    def compile_final_report(self, client_analysis, interview_analysis, other_files_analysis=None, user_input=None,
+                             context=None) -> Task:
         return Task(description=dedent(f"""
             다음 사항을 종합적으로 고려하여 각 수행 종류별 분석 보고서를 작성하시오.
             - 클라이언트 요구사항
@@ -269,9 +375,7 @@ class GapAnalysisCrew:
             - (있을 경우) 사용자 추가 수정 요청사항
 
             참고 맥락:
-            > 클라이언트 맥락: {client_analysis}
-            > 인터뷰 맥락: {interview_analysis}
-            > 기타 파일 맥락: {other_files_analysis if other_files_analysis else "없음"}
+            {SHARED_CONTEXT_REFERENCE} 연구원들의 분석 결과도 함께 제공됩니다.
 
             ** > 사용자 추가 수정 요청사항: {user_input} **
 
@@ -326,31 +430,86 @@ class GapAnalysisCrew:
             각 표는 해당 수행 문제의 핵심 내용을 간단명료하게 정리하여 제시해야 합니다.
         """),
             agent=self.pm(),
-            expected_output="맥락 기반 수행 종류별 원인 분석 및 해결방안 종합 보고서"
+            expected_output="맥락 기반 수행 종류별 원인 분석 및 해결방안 종합 보고서",
+            context=context
         )
 
-    def crew(self) -> Crew:
+    def research_tasks(self) -> list:
+        return [
+            self.analyze_performance(self.client_analysis, self.interview_analysis, self.other_files_analysis),
+            self.analyze_achievement(self.client_analysis, self.interview_analysis, self.other_files_analysis),
+            self.analyze_environment(self.client_analysis, self.interview_analysis, self.other_files_analysis),
+            self.analyze_solution(self.client_analysis, self.interview_analysis, self.other_files_analysis),
+        ]
+
+    def crew(self, research_tasks=None, pending_tasks=None, memory_config=None) -> Crew:
+        """GapAnalysisCrew 구성
+
+        Args:
+            research_tasks (list): 최종 보고서의 맥락이 될 연구원 작업 (기본값: 새로 생성)
+            pending_tasks (list): research_tasks 중 실제로 실행할 작업 (기본값: 전부).
+                제외된 작업은 task.output 에 저장된 결과가 있어야 합니다.
+            memory_config (dict): crew_memory() 가 제공하는 메모리 설정 (기본값: 메모리 사용 안 함)
+        """
+        if research_tasks is None:
+            research_tasks = self.research_tasks()
+        if pending_tasks is None:
+            pending_tasks = research_tasks
+        if memory_config is None:
+            memory_config = {"memory": False}
+        agents = [
+            self.pm(),
+            self.performance_researcher(),
+            self.achievement_researcher(),
+            self.environment_researcher(),
+            self.solution_researcher()
+        ]
+        # 단계 콜백에는 에이전트 정보가 없으므로 에이전트마다 역할을 묶어서 등록
+        for agent in agents:
+            agent.step_callback = functools.partial(self._on_step, agent.role) if self.on_event else None
         return Crew(
-            agents=[
-                self.pm(),
-                self.performance_researcher(),
-                self.achievement_researcher(),
-                self.environment_researcher(),
-                self.solution_researcher()
-            ],
+            agents=agents,
             tasks=[
-                self.analyze_performance(self.client_analysis, self.interview_analysis, self.other_files_analysis),
-                self.analyze_achievement(self.client_analysis, self.interview_analysis, self.other_files_analysis),
-                self.analyze_environment(self.client_analysis, self.interview_analysis, self.other_files_analysis),
-                self.analyze_solution(self.client_analysis, self.interview_analysis, self.other_files_analysis),
-                self.compile_final_report(self.client_analysis, self.interview_analysis, self.other_files_analysis)
+                *pending_tasks,
+                # 최종 보고서는 4개 연구원 결과를 모두 맥락으로 받음 (비동기 실행 시 모두 끝날 때까지 대기)
+                self.compile_final_report(self.client_analysis, self.interview_analysis, self.other_files_analysis,
+                                          user_input=self.user_input,
+                                          context=[self.shared_context(self.client_analysis, self.interview_analysis,
+                                                                       self.other_files_analysis),
+                                                   *research_tasks])
             ],
             process=Process.sequential,
             verbose=True,
-            memory=True,
-            manager_agent=self.pm()
+            manager_agent=self.pm(),
+            task_callback=self._on_task_done if self.on_event else None,
+            **memory_config
         )
 
+    def _emit(self, message):
+        """on_event 로 진행 메시지 전달 (콜백 오류가 crew 실행을 중단시키지 않도록 기록만 함)"""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(message)
+        except Exception:
+            logger.warning("Failed to deliver crew event", exc_info=True)
+
+    def _on_step(self, role, step):
+        """에이전트 단계 콜백 (AgentAction: 도구 사용, AgentFinish: 최종 답변)"""
+        thought = (getattr(step, "thought", "") or "").strip()
+        tool = getattr(step, "tool", None)
+        if tool:
+            message = f"**{role}** 🔧 `{tool}` 사용"
+        elif hasattr(step, "output"):
+            message = f"**{role}** 💡 최종 답변 작성"
+        else:
+            return
+        self._emit(f"{message}\n\n{thought}" if thought else message)
+
+    def _on_task_done(self, output):
+        """작업 완료 콜백: 담당 에이전트와 작업 결과를 전달"""
+        self._emit(f"**{output.agent}** ✅ 작업 완료\n\n{output.raw}")
+
     def analyze(self, client_analysis: str, interview_analysis: str, other_files_analysis: str = None, user_input: str = None):
         try:
             inputs = {
@@ -360,85 +519,99 @@ class GapAnalysisCrew:
                 "user_input": user_input
             }
             
-            crew_instance = self.crew()
-            result = crew_instance.kickoff(inputs=inputs)
-            result_str = str(result)
+            # 메모리 저장소는 crew 실행 동안만 열어 두고, 임시(ephemeral) 저장소는 실행 후 삭제
+            with crew_memory(self.memory_mode, self.memory_scope) as memory_config:
+                # 에이전트·작업·crew 구성 시간 (LLM 은 프로세스 전체에서, 에이전트는 인스턴스 안에서 재사용)
+                build_started_at = time.perf_counter()
+                research_tasks = self.research_tasks()
+                task_cache = get_task_cache()
+
+                # 입력과 프롬프트가 같은 연구원 작업은 저장된 결과로 대체
+                pending_tasks = []
+                for task in research_tasks:
+                    cached = task_cache.get(self._task_key(task)) if self.reuse_outputs else None
+                    if cached is None:
+                        pending_tasks.append(task)
+                    else:
+                        task.output = TaskOutput(description=task.description, raw=cached, agent=task.agent.role)
+                        self._emit(f"**{task.agent.role}** ♻️ 이전 분석 결과 재사용")
+                logger.info(f"Reusing {len(research_tasks) - len(pending_tasks)}/{len(research_tasks)} researcher outputs")
+
+                crew_instance = self.crew(research_tasks=research_tasks, pending_tasks=pending_tasks,
+                                          memory_config=memory_config)
+                final_task = crew_instance.tasks[-1]
+                logger.info(f"GapAnalysisCrew built in {(time.perf_counter() - build_started_at) * 1000:.0f}ms")
+
+                # 연구원 결과와 최종 보고서 지시사항까지 모두 같으면 crew 를 실행하지 않음
+                if self.reuse_outputs and not pending_tasks:
+                    final_key = self._task_key(final_task)
+                    cached = task_cache.get(final_key)
+                    if cached is not None:
+                        logger.info("Reusing final report, crew not run")
+                        self._emit("♻️ 입력이 같아 이전 최종 보고서를 재사용합니다.")
+                        return cached
+
+                pending_keys = [self._task_key(task) for task in pending_tasks]
+                started_at = time.perf_counter()
+                result = crew_instance.kickoff(inputs=inputs)
+                self.last_usage = getattr(result, "token_usage", None)
+                logger.info(
+                    f"GapAnalysisCrew finished in {time.perf_counter() - started_at:.1f}s "
+                    f"(parallel_research={self.parallel_research}, memory={self.memory_mode or CREW_MEMORY_MODE}, "
+                    f"tasks run={len(pending_tasks) + 1})"
+                )
+                if self.last_usage is not None:
+                    logger.info(
+                        f"GapAnalysisCrew token usage: prompt={self.last_usage.prompt_tokens}, "
+                        f"completion={self.last_usage.completion_tokens}, total={self.last_usage.total_tokens}, "
+                        f"requests={self.last_usage.successful_requests}"
+                    )
+                result_str = str(result)
+
+                for task, key in zip(pending_tasks, pending_keys):
+                    if task.output is not None:
+                        task_cache.set(key, task.output.raw)
+                task_cache.set(self._task_key(final_task), result_str)
             
-            return result_str
+                return result_str
             
         except Exception as e:
-            raise Exception
-
-
-class StreamToExpander:
-    def __init__(self, expander):
-        self.expander = expander
-        self.buffer = []
-        self.colors = ['red', 'green', 'blue', 'orange', 'violet', 'gray']  # Added one more color for the additional agent
-        self.color_index = 0
-
-    def write(self, data):
-        # Filter out ANSI escape codes using a regular expression
-        cleaned_data = re.sub(r'\x1B\[[0-9;]*[mK]', '', data)
-
-        # Check if the data contains 'task' information
-        task_match_object = re.search(r'\"task\"\s*:\s*\"(.*?)\"', cleaned_data, re.IGNORECASE)
-        task_match_input = re.search(r'task\s*:\s*([^\n]*)', cleaned_data, re.IGNORECASE)
-        task_value = None
-        if task_match_object:
-            task_value = task_match_object.group(1)
-        elif task_match_input:
-            task_value = task_match_input.group(1).strip()
-
-        if task_value:
-            st.toast(":microscope: " + task_value)  # Changed emoji to reflect analysis work
-
-        # Check if the text contains the specified phrase and apply color
-        if "Entering new CrewAgentExecutor chain" in cleaned_data:
-            self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("Entering new CrewAgentExecutor chain", f":{self.colors[self.color_index]}[Entering new CrewAgentExecutor chain]")
-
-        cleaned_data = cleaned_data.split("> 클라이언트 요구사항:")[0].strip()
-        cleaned_data = cleaned_data.split("참고 맥락:")[0].strip()
-        # 정규 표현식을 사용하여 특정 패턴을 제거
-        pattern = r"[\s]*참고 맥락:.*?위 맥락을 기반으로 수행 문제를 사실적으로 기술하고, 원인 분석 및 해결방안을 구분하여 정리하시오.\n"
-        cleaned_data = re.sub(pattern, "", cleaned_data, flags=re.DOTALL)
-
-        current_agent = None
-
-        # Replace agent names with the new ones and apply colors
-        if "프로젝트 매니저" in cleaned_data:
-            if current_agent != "프로젝트 매니저":
-                current_agent = "프로젝트 매니저"
-                self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("프로젝트 매니저", f":{self.colors[self.color_index]}[프로젝트 매니저]")
-        if "수행 분석 연구원" in cleaned_data:
-            if current_agent != "수행 분석 연구원":
-                current_agent = "수행 분석 연구원"
-                self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("수행 분석 연구원", f":{self.colors[self.color_index]}[수행 분석 연구원]")
-        if "성과 분석 연구원" in cleaned_data:
-            if current_agent != "성과 분석 연구원":
-                current_agent = "성과 분석 연구원"
-                self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("성과 분석 연구원", f":{self.colors[self.color_index]}[성과 분석 연구원]")
-        if "환경 분석 연구원" in cleaned_data:
-            if current_agent != "환경 분석 연구원":
-                current_agent = "환경 분석 연구원"
-                self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("환경 분석 연구원", f":{self.colors[self.color_index]}[환경 분석 연구원]")
-        if "원인 및 해결방안 연구원" in cleaned_data:
-            if current_agent != "원인 및 해결방안 연구원":
-                current_agent = "원인 및 해결방안 연구원"
-                self.color_index = (self.color_index + 1) % len(self.colors)
-            cleaned_data = cleaned_data.replace("원인 및 해결방안 연구원", f":{self.colors[self.color_index]}[원인 및 해결방안 연구원]")
-        if "Finished chain." in cleaned_data:
-            cleaned_data = cleaned_data.replace("Finished chain.", f":{self.colors[self.color_index]}[Finished chain.]")
-
-        self.buffer.append(cleaned_data)
-        if "\n" in data:
-            self.expander.markdown(''.join(self.buffer), unsafe_allow_html=True)
-            self.buffer = []
+            logger.error(f"GapAnalysisCrew failed: {e!r}")
+            raise
+
+    @staticmethod
+    def _task_key(task) -> str:
+        """작업 결과 저장 키: 담당 모델·역할·기대 결과·작업 설명, 그리고 맥락(context) 작업들의 결과"""
+        context = "\n\n".join(context_task.output.raw for context_task in task.context or [])
+        return ResponseCache.make_key(
+            task.agent.llm.model,
+            f"{task.agent.role}\n{task.expected_output}",
+            f"{task.description}\n\n{context}"
+        )
+
+
+def highlight_agent_names(text):
+    """진행 메시지의 에이전트 이름에 에이전트별 색을 적용 (Streamlit markdown 색 문법)"""
+    return _AGENT_NAME_PATTERN.sub(lambda match: f":{AGENT_COLORS[match.group(0)]}[{match.group(0)}]", text)
+
+
+def run_gap_analysis(params, progress):
+    """JobManager 작업: params(GapAnalysisCrew 생성 인자)로 crew 를 실행하고 최종 보고서를 반환"""
+    progress("🏗️ 에이전트 구성 중...")
+    crew = GapAnalysisCrew(**params, on_event=progress)
+    progress("🚀 분석 실행 중...")
+    final_report = crew.analyze(
+        params["client_analysis"],
+        params["interview_analysis"],
+        params.get("other_files_analysis"),
+        user_input=params.get("user_input")
+    )
+    usage = crew.last_usage
+    if usage is not None:
+        progress(f"✅ 분석 완료 (토큰 {usage.total_tokens:,}개, 요청 {usage.successful_requests}회)")
+    else:
+        progress("✅ 분석 완료")
+    return final_report
 
 # #--------------------------------#
 # #         EXA Answer Tool        #
@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+from functools import lru_cache
+
+from .llm import get_chat_completion, get_chat_completions
+from .prompts import CHUNK_SUMMARY_PROMPT, RELATED_DOCUMENTS_PROMPT, RELATED_DOCUMENTS_MERGE_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 분석 요청에 넣을 문서의 최대 토큰 수와 분할 단위 (환경변수로 조정 가능)
+SUMMARY_TOKEN_BUDGET = int(os.environ.get("SUMMARY_TOKEN_BUDGET", "24000"))
+SUMMARY_CHUNK_TOKENS = int(os.environ.get("SUMMARY_CHUNK_TOKENS", "6000"))
+SUMMARY_MAX_LEVELS = 4
+
+
+def _cache_key(prompt: str) -> str:
+    """프롬프트 전문(문서 내용 + 분석 지침)의 SHA-256 해시"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+#--------------------------------#
+#     Map-Reduce Summarization   #
+#--------------------------------#
+def summarize_documents(documents, analysis_guide, cache=None, max_concurrency=None, use_cache=True,
+                        on_delta=None) -> str:
+    """여러 문서를 각각 요약(map)한 뒤, 부분 요약들을 하나로 통합(reduce)
+
+    Args:
+        documents (list): (파일 이름, 추출된 텍스트) 튜플 목록
+        analysis_guide (str): 사용자가 수정 가능한 기타 파일 분석 프롬프트
+        cache (dict): 문서별 요약 캐시 (프롬프트 해시 -> 요약). 파일이 추가되어도
+            이미 요약한 문서는 다시 요청하지 않음
+        max_concurrency (int): 문서별 요약 요청의 동시 실행 개수
+        use_cache (bool): False 이면 문서별 요약 캐시와 LLM 응답 캐시를 모두 건너뜀
+        on_delta (callable): 최종 결과가 생성되는 동안 토큰 조각을 받을 콜백
+
+    Returns:
+        str: 통합 분석 결과 (문서가 하나면 해당 문서의 요약)
+    """
+    if cache is None:
+        cache = {}
+
+    # 같은 이름의 파일이 여러 개일 수 있으므로 업로드 순서(index)를 key로 사용
+    prompts = {
+        index: RELATED_DOCUMENTS_PROMPT["system"].format(
+            text=f"=== {name} ===\n{text}",
+            analysis_guide=analysis_guide
+        )
+        for index, (name, text) in enumerate(documents)
+    }
+    keys = {index: _cache_key(prompt) for index, prompt in prompts.items()}
+
+    partial_summaries = {
+        index: cache[key] for index, key in keys.items() if use_cache and key in cache
+    }
+    pending = {index: prompt for index, prompt in prompts.items() if index not in partial_summaries}
+    logger.info(f"Map step: {len(partial_summaries)} cached, {len(pending)} to summarize")
+
+    # Map: 캐시에 없는 문서만 동시에 요약
+    for index, summary in get_chat_completions(pending, max_concurrency=max_concurrency, use_cache=use_cache):
+        partial_summaries[index] = summary
+        cache[keys[index]] = summary
+
+    if len(partial_summaries) == 1:
+        if on_delta:
+            on_delta(partial_summaries[0])
+        return partial_summaries[0]
+
+    # Reduce: 업로드 순서대로 부분 요약을 모아 한 번에 통합
+    combined_summaries = "".join(
+        f"\n\n=== {name} ===\n{partial_summaries[index]}"
+        for index, (name, _) in enumerate(documents)
+    )
+    merge_prompt = RELATED_DOCUMENTS_MERGE_PROMPT["system"].format(
+        text=combined_summaries,
+        analysis_guide=RELATED_DOCUMENTS_MERGE_PROMPT["user"],
+        original_guide=analysis_guide
+    )
+    return get_chat_completion(merge_prompt, use_cache=use_cache, on_delta=on_delta)
+
+
+#--------------------------------#
+#   Token-aware Chunking         #
+#--------------------------------#
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken 인코더 (설치되어 있지 않거나 로드에 실패하면 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 토큰 수 추정
+
+    tiktoken 을 사용할 수 없으면 영문은 4글자당 1토큰, 한글 등 비ASCII 문자는
+    글자당 1토큰으로 보수적으로 추정합니다.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def _split_units(text: str, max_tokens: int) -> list:
+    """max_tokens 를 넘는 텍스트를 문단 -> 줄 -> 글자 수 순으로 잘게 분할"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return [text]
+    for separator in ("\n\n", "\n"):
+        parts = [part for part in text.split(separator) if part.strip()]
+        if len(parts) > 1:
+            return [unit for part in parts for unit in _split_units(part, max_tokens)]
+    # 구분자가 없는 긴 텍스트는 글자 수 기준으로 자름
+    step = max(1, len(text) * max_tokens // tokens)
+    return [text[i:i + step] for i in range(0, len(text), step)]
+
+
+def chunk_text(pages, max_tokens=None) -> list:
+    """페이지(또는 문단) 경계를 유지하면서 max_tokens 이하의 청크로 묶음
+
+    Args:
+        pages (list | str): 페이지별 텍스트 목록 또는 하나의 텍스트
+        max_tokens (int): 청크당 최대 토큰 수 (기본값: SUMMARY_CHUNK_TOKENS)
+    """
+    max_tokens = max_tokens or SUMMARY_CHUNK_TOKENS
+    if isinstance(pages, str):
+        pages = [pages]
+
+    chunks, current, current_tokens = [], [], 0
+    for page in pages:
+        for unit in _split_units(page, max_tokens):
+            tokens = estimate_tokens(unit)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+#--------------------------------#
+#  Hierarchical Summarization    #
+#--------------------------------#
+def summarize_long_text(pages, prompt_template, analysis_guide, token_budget=None,
+                        chunk_tokens=None, max_concurrency=None, stats=None, use_cache=True,
+                        on_delta=None) -> str:
+    """긴 문서를 토큰 예산 안에 들어올 때까지 계층적으로 요약한 뒤 최종 분석
+
+    문서가 token_budget 을 넘으면 청크로 나누어 동시에 요약하고, 요약본이
+    다시 예산을 넘으면 요약본을 같은 방식으로 한 단계 더 요약합니다.
+
+    Args:
+        pages (list | str): 페이지별 텍스트 목록 또는 하나의 텍스트
+        prompt_template (dict): 최종 분석에 사용할 프롬프트 (예: CLIENT_REQUIREMENTS_PROMPT)
+        analysis_guide (str): 사용자가 수정 가능한 분석 프롬프트
+        token_budget (int): 최종 분석에 넣을 문서의 최대 토큰 수 (기본값: SUMMARY_TOKEN_BUDGET)
+        chunk_tokens (int): 청크당 최대 토큰 수 (기본값: SUMMARY_CHUNK_TOKENS)
+        max_concurrency (int): 청크 요약 요청의 동시 실행 개수
+        stats (dict): 튜닝용 통계를 채워 돌려받을 dict
+            - input_tokens: 원문 토큰 수
+            - levels: 요약 단계 수 (0이면 원문을 그대로 분석)
+            - chunk_tokens: 단계별 청크 토큰 수 목록
+            - final_tokens: 최종 분석 프롬프트 토큰 수
+        use_cache (bool): False 이면 LLM 응답 캐시를 건너뜀
+        on_delta (callable): 최종 분석이 생성되는 동안 토큰 조각을 받을 콜백
+    """
+    token_budget = token_budget or SUMMARY_TOKEN_BUDGET
+    chunk_tokens = min(chunk_tokens or SUMMARY_CHUNK_TOKENS, token_budget)
+    if stats is None:
+        stats = {}
+
+    units = [pages] if isinstance(pages, str) else list(pages)
+    text = "".join(units)
+    stats.update(input_tokens=estimate_tokens(text), levels=0, chunk_tokens=[])
+
+    while estimate_tokens(text) > token_budget and stats["levels"] < SUMMARY_MAX_LEVELS:
+        chunks = chunk_text(units, chunk_tokens)
+        stats["chunk_tokens"].append([estimate_tokens(chunk) for chunk in chunks])
+        prompts = {
+            index: CHUNK_SUMMARY_PROMPT["system"].format(
+                text=chunk,
+                analysis_guide=CHUNK_SUMMARY_PROMPT["user"].format(part=index + 1, total=len(chunks)),
+                original_guide=analysis_guide
+            )
+            for index, chunk in enumerate(chunks)
+        }
+        summaries = dict(get_chat_completions(prompts, max_concurrency=max_concurrency, use_cache=use_cache))
+        units = [summaries[index] for index in range(len(chunks))]
+        text = "\n\n".join(units)
+        stats["levels"] += 1
+
+    final_prompt = prompt_template["system"].format(text=text, analysis_guide=analysis_guide)
+    stats["final_tokens"] = estimate_tokens(final_prompt)
+    logger.info(
+        f"Hierarchical summary: {stats['input_tokens']} tokens -> {stats['levels']} level(s), "
+        f"chunks per level {[len(level) for level in stats['chunk_tokens']]}, "
+        f"final prompt {stats['final_tokens']} tokens"
+    )
+    return get_chat_completion(final_prompt, use_cache=use_cache, on_delta=on_delta)
@@ -0,0 +1,276 @@
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 작업 프로세스 설정 (환경변수로 조정 가능)
+JOB_MEMORY_LIMIT_MB = int(os.environ.get("JOB_MEMORY_LIMIT_MB", "2048"))  # 작업 프로세스 RSS 상한, 0 이면 제한 없음
+JOB_TIME_LIMIT = int(os.environ.get("JOB_TIME_LIMIT", str(30 * 60)))  # 작업당 최대 실행 시간(초), 0 이면 제한 없음
+JOB_WORKER_START_METHOD = os.environ.get("JOB_WORKER_START_METHOD", "spawn")
+SUPERVISE_INTERVAL = 0.5
+# 감독 주기마다 처리할 최대 메시지 수 (이벤트가 계속 와도 제한 검사를 건너뛰지 않도록)
+SUPERVISE_MAX_MESSAGES = 200
+# 제한을 넘긴 작업 프로세스에 종료(SIGTERM)를 요청한 뒤 강제 종료(SIGKILL)까지 기다리는 시간(초)
+WORKER_TERMINATE_TIMEOUT = 5
+# 작업 프로세스가 시작 후 WORKER_EARLY_DEATH_SECONDS 초 안에 비정상 종료하면 조기 종료로 보고,
+# 연속된 조기 종료마다 다시 띄우기 전 대기 시간을 두 배로 늘림 (최대 WORKER_RESPAWN_BACKOFF_MAX 초)
+WORKER_EARLY_DEATH_SECONDS = 10
+WORKER_RESPAWN_BACKOFF = 1
+WORKER_RESPAWN_BACKOFF_MAX = 60
+# 연속 조기 종료가 이 횟수에 이르면 대기 중인 작업을 실패 처리하고 더 이상 작업 프로세스를 띄우지 않음
+WORKER_MAX_EARLY_DEATHS = 5
+
+# 작업 프로세스 -> 서버 프로세스 메시지 종류
+STARTED, EVENT, COMPLETED, FAILED = "started", "event", "completed", "failed"
+
+
+#--------------------------------#
+#         Worker Process         #
+#--------------------------------#
+def _worker_main(index, tasks, results, current_job):
+    """작업 대기열에서 (job_id, fn, params) 를 하나씩 꺼내 실행하고 결과를 results 로 전송
+
+    results 는 이 작업 프로세스 전용 파이프이므로, 프로세스가 강제 종료되어도 다른
+    작업 프로세스의 메시지에는 영향이 없습니다. 실행 중인 작업 ID 는 공유 메모리
+    (current_job)에도 기록하여, 프로세스가 메시지를 보내기 전에 죽더라도 서버 프로세스가
+    어떤 작업이 중단되었는지 알 수 있게 합니다.
+    """
+    # ChromaDB(crew 메모리)가 요구하는 SQLite 버전 보장 (페이지 스크립트와 동일한 처리)
+    try:
+        import sys
+        __import__('pysqlite3')
+        sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+    except (ImportError, KeyError):
+        pass
+    # Ctrl+C 는 서버 프로세스가 처리하고 작업 프로세스는 종료 요청(None)으로 정리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO)
+
+    # 진행 이벤트는 crew 의 비동기 작업 스레드에서도 보내므로 파이프 쓰기를 직렬화
+    send_lock = threading.Lock()
+
+    def send(*message):
+        with send_lock:
+            results.send(message)
+
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        job_id, fn, params = item
+        current_job.value = job_id.encode()
+        send(STARTED, job_id, index)
+        try:
+            result = fn(params, lambda message: send(EVENT, job_id, message))
+        except Exception as e:
+            logger.error(f"Job {job_id} failed in worker {index}: {e!r}", exc_info=True)
+            send(FAILED, job_id, str(e) or repr(e))
+        else:
+            send(COMPLETED, job_id, result)
+        current_job.value = b""
+
+
+def _rss_bytes(pid):
+    """프로세스의 상주 메모리(RSS) 크기 (/proc 를 읽을 수 없는 환경이면 None)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+#--------------------------------#
+#          Worker Pool           #
+#--------------------------------#
+class WorkerPool:
+    """로컬 대기열로 작업을 받아 별도 프로세스에서 실행하는 작업 프로세스 풀
+
+    crew 는 서버 프로세스와 GIL·메모리를 나누지 않고 작업 프로세스에서 실행되며,
+    진행 이벤트와 결과는 작업 프로세스마다 따로 둔 파이프로 돌아옵니다. 감독 스레드가
+    주기마다 최대 SUPERVISE_MAX_MESSAGES 개의 결과를 on_message(종류, job_id, 값)로 전달하고,
+    다음 경우 해당 작업을 실패 처리한 뒤 작업 프로세스를 새로 띄웁니다.
+    - 작업 프로세스가 비정상 종료된 경우
+    - 작업이 time_limit 초를 넘긴 경우
+    - 작업 프로세스의 RSS 가 memory_limit_mb 를 넘긴 경우
+
+    작업 프로세스가 시작 직후 계속 죽으면(임포트 오류 등) 지수적으로 늘어나는 간격을 두고 다시 띄우며,
+    연속 조기 종료가 WORKER_MAX_EARLY_DEATHS 번에 이르면 대기 중인 작업과 이후 제출되는 작업을
+    실패 처리하고 더 이상 작업 프로세스를 띄우지 않습니다.
+    """
+
+    def __init__(self, num_workers, on_message, time_limit=JOB_TIME_LIMIT,
+                 memory_limit_mb=JOB_MEMORY_LIMIT_MB, start_method=JOB_WORKER_START_METHOD):
+        self.on_message = on_message
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self._context = multiprocessing.get_context(start_method)
+        self._tasks = self._context.Queue()
+        self._results = [None] * max(1, num_workers)  # 작업 프로세스별 결과 파이프(읽기 쪽)
+        self._current_jobs = [self._context.Array("c", 64, lock=False) for _ in range(max(1, num_workers))]
+        self._spawned_at = [None] * max(1, num_workers)
+        self._respawn_at = {}  # 다시 띄우기를 기다리는 작업 프로세스 index -> 시각
+        self._early_deaths = 0  # 연속 조기 종료 횟수
+        self._failure = None  # 작업 프로세스를 더 이상 띄우지 않게 된 이유
+        self._workers = [self._spawn(index) for index in range(max(1, num_workers))]
+        self._running = {}  # 작업 프로세스 index -> (job_id, 시작 시각)
+        self._closed = False
+        self._supervisor = threading.Thread(target=self._supervise, name="crew-worker-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def _spawn(self, index):
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self._tasks, writer, self._current_jobs[index]),
+            name=f"crew-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self._spawned_at[index] = time.monotonic()
+        writer.close()  # 작업 프로세스가 종료되면 읽기 쪽에서 EOF 를 받도록 서버 쪽 쓰기 끝은 닫음
+        if self._results[index] is not None:
+            self._results[index].close()
+        self._results[index] = reader
+        logger.info(f"Started crew worker {index} (pid {process.pid})")
+        return process
+
+    def submit(self, job_id, fn, params):
+        """작업을 대기열에 넣음 (fn 은 모듈 최상위 함수여야 함)"""
+        self._tasks.put((job_id, fn, params))
+
+    def _supervise(self):
+        while not self._closed:
+            self._drain_results()
+            self._check_workers()
+            if self._failure:
+                self._fail_queued()
+
+    def _drain_results(self):
+        readers = [reader for reader in self._results if not reader.closed]
+        if not readers:
+            time.sleep(SUPERVISE_INTERVAL)
+            return
+        ready = multiprocessing.connection.wait(readers, timeout=SUPERVISE_INTERVAL)
+        # 작업 프로세스마다 같은 몫을 처리하여 한 작업의 이벤트가 다른 작업의 결과를 막지 않도록 함
+        budget = max(1, SUPERVISE_MAX_MESSAGES // max(1, len(ready)))
+        for reader in ready:
+            self._read_messages(reader, budget)
+
+    def _read_messages(self, reader, budget=None):
+        """파이프에 쌓인 메시지를 최대 budget 개(None 이면 모두) 처리"""
+        count = 0
+        while budget is None or count < budget:
+            if not reader.poll():
+                break
+            try:
+                message = reader.recv()
+            except (EOFError, OSError):
+                break  # 작업 프로세스 종료: _check_workers 가 처리
+            except Exception:
+                logger.error("Dropped unreadable worker message", exc_info=True)
+                break
+            self._handle_message(*message)
+            count += 1
+
+    def _handle_message(self, kind, job_id, payload):
+        if kind == STARTED:
+            self._running[payload] = (job_id, time.monotonic())
+            payload = None
+        elif kind in (COMPLETED, FAILED):
+            self._running = {index: entry for index, entry in self._running.items() if entry[0] != job_id}
+        try:
+            self.on_message(kind, job_id, payload)
+        except Exception:
+            logger.error(f"Failed to record worker message for job {job_id}", exc_info=True)
+
+    def _check_workers(self):
+        now = time.monotonic()
+        for index, process in enumerate(self._workers):
+            if process is None:
+                if not self._closed and not self._failure and now >= self._respawn_at[index]:
+                    del self._respawn_at[index]
+                    self._workers[index] = self._spawn(index)
+                continue
+
+            job_id, started_at = self._running.get(index, (None, None))
+            early_death = False
+            if not process.is_alive():
+                # 종료 직전에 보낸 결과를 먼저 처리 (끝난 작업을 실패로 기록하지 않도록)
+                self._read_messages(self._results[index])
+                job_id, started_at = self._running.get(index, (None, None))
+                job_id = job_id or self._current_jobs[index].value.decode() or None
+                early_death = now - self._spawned_at[index] < WORKER_EARLY_DEATH_SECONDS
+                reason = f"작업 프로세스가 비정상 종료되었습니다 (exit code {process.exitcode})."
+            elif job_id is None:
+                if self._early_deaths and now - self._spawned_at[index] >= WORKER_EARLY_DEATH_SECONDS:
+                    self._early_deaths = 0
+                continue
+            elif self.time_limit and now - started_at > self.time_limit:
+                reason = f"작업 시간 제한({self.time_limit}초)을 초과했습니다."
+            elif self.memory_limit and (_rss_bytes(process.pid) or 0) > self.memory_limit:
+                reason = f"작업 메모리 제한({self.memory_limit // (1024 * 1024)}MB)을 초과했습니다."
+            else:
+                continue
+
+            logger.warning(f"Stopping crew worker {index} (pid {process.pid}): {reason}")
+            if process.is_alive():
+                process.terminate()
+                process.join(WORKER_TERMINATE_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+            process.join()
+            # 다시 띄울 때까지 감독 스레드가 EOF 로 계속 깨어나지 않도록 파이프를 닫음
+            self._results[index].close()
+            self._running.pop(index, None)
+            self._current_jobs[index].value = b""
+            self._workers[index] = None
+            if job_id is not None:
+                self.on_message(FAILED, job_id, reason)
+            if self._closed or self._failure:
+                continue
+
+            if not early_death:
+                self._early_deaths = 0
+                self._respawn_at[index] = now
+                continue
+            self._early_deaths += 1
+            if self._early_deaths >= WORKER_MAX_EARLY_DEATHS:
+                self._give_up(f"작업 프로세스가 시작 직후 {self._early_deaths}번 연속 종료되어 작업을 실행할 수 없습니다.")
+                continue
+            delay = min(WORKER_RESPAWN_BACKOFF * 2 ** (self._early_deaths - 1), WORKER_RESPAWN_BACKOFF_MAX)
+            logger.warning(f"Restarting crew worker {index} in {delay}s ({self._early_deaths} early deaths in a row)")
+            self._respawn_at[index] = now + delay
+
+    def _give_up(self, reason):
+        """작업 프로세스를 더 이상 띄우지 않음 (대기열의 작업은 감독 주기마다 실패 처리)"""
+        logger.error(f"Stopped respawning crew workers: {reason}")
+        self._failure = reason
+        self._respawn_at.clear()
+
+    def _fail_queued(self):
+        while True:
+            try:
+                item = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.on_message(FAILED, item[0], self._failure)
+
+    def shutdown(self, timeout=5):
+        """작업 프로세스에 종료를 요청하고, timeout 안에 끝나지 않으면 강제 종료"""
+        self._closed = True
+        workers = [process for process in self._workers if process is not None]
+        for _ in workers:
+            self._tasks.put(None)
+        for process in workers:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+        for reader in self._results:
+            reader.close()
@@ -0,0 +1,575 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# 보고서 내보내기 설정 (환경변수로 조정 가능)
+EXPORT_STATUS_PATH = os.environ.get("EXPORT_STATUS_PATH", ".cache/export_status.json")
+EXPORT_PANDOC_DIR = os.environ.get("EXPORT_PANDOC_DIR", ".cache/pandoc")
+# pandoc 이 없을 때 변환기 준비 단계에서 내려받을지 여부 (0 이면 내장 DOCX 변환기만 사용)
+EXPORT_DOWNLOAD_PANDOC = os.environ.get("EXPORT_DOWNLOAD_PANDOC", "1") == "1"
+# 내보내기 파일 변환 스레드 수, 보관할 변환 결과 수, 외부 렌더러 제한 시간(초)
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "2"))
+EXPORT_CACHE_ENTRIES = int(os.environ.get("EXPORT_CACHE_ENTRIES", "64"))
+EXPORT_TIMEOUT = int(os.environ.get("EXPORT_TIMEOUT", "120"))
+
+REPORT_TITLE = "수행 문제 분석 보고서"
+
+PENDING, READY = "pending", "ready"
+PANDOC, BUILTIN = "pandoc", "builtin"
+
+try:
+    import pypandoc
+except ImportError:
+    pypandoc = None
+
+
+#--------------------------------#
+#     Converter Provisioning     #
+#--------------------------------#
+_status = {"state": PENDING, "converter": BUILTIN, "pandoc_version": None, "pandoc_path": None, "pdf_engine": None,
+           "error": None}
+_status_lock = threading.Lock()
+_setup_thread = None
+_loaded = False
+
+
+def _write_status():
+    """서버와 헬스 체크(별도 프로세스)가 읽을 수 있도록 상태를 파일로 기록"""
+    path = Path(EXPORT_STATUS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({**_status, "updated_at": time.time()}), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_status():
+    """준비 단계가 기록한 상태 (파일이 없거나 읽을 수 없으면 None)"""
+    try:
+        return json.loads(Path(EXPORT_STATUS_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _find_pandoc():
+    """사용 가능한 pandoc 버전 (없으면 None)"""
+    if pypandoc is None:
+        return None
+    try:
+        return pypandoc.get_pandoc_version()
+    except OSError:
+        return None
+
+
+def _find_pdf_engine():
+    """HTML 보고서를 PDF 로 만들 로컬 렌더러 (weasyprint 패키지 또는 wkhtmltopdf, 없으면 None)"""
+    try:
+        import weasyprint  # noqa: F401
+        return "weasyprint"
+    except Exception:
+        pass
+    if shutil.which("wkhtmltopdf"):
+        return "wkhtmltopdf"
+    return None
+
+
+def _setup(write_status=True):
+    version = _find_pandoc()
+    pandoc_path = None
+    error = None
+    if version is None and pypandoc is not None and EXPORT_DOWNLOAD_PANDOC:
+        try:
+            logger.info(f"pandoc not found, downloading to {EXPORT_PANDOC_DIR}")
+            pypandoc.download_pandoc(targetfolder=EXPORT_PANDOC_DIR, delete_installer=True)
+            pandoc_path = str(Path(EXPORT_PANDOC_DIR).resolve() / "pandoc")
+            os.environ["PYPANDOC_PANDOC"] = pandoc_path
+            version = _find_pandoc()
+        except Exception as e:
+            error = f"pandoc download failed: {e}"
+            logger.warning(error)
+
+    with _status_lock:
+        _status.update(
+            state=READY,
+            converter=PANDOC if version else BUILTIN,
+            pandoc_version=version,
+            pandoc_path=pandoc_path if version else None,
+            pdf_engine=_find_pdf_engine(),
+            error=error
+        )
+        if write_status:
+            _write_status()
+    logger.info(
+        f"Report export ready (converter={_status['converter']}, pandoc={version}, pdf={_status['pdf_engine']})"
+    )
+
+
+def setup_export():
+    """서버 시작 전에 변환기(pandoc)를 찾거나 내려받고 상태 파일을 기록 (python -m src.utils.export --setup)"""
+    with _status_lock:
+        _write_status()
+    _setup()
+
+
+def start_export_setup():
+    """서버 프로세스에서 한 번 변환기 상태를 불러옴 (여러 번 호출해도 한 번만 실행)
+
+    준비 단계(--setup)가 기록한 상태 파일이 있으면 그대로 사용하고, 없으면(개발 환경 등) 백그라운드
+    스레드에서 준비합니다. 준비가 끝나기 전에도 내장 DOCX 변환기로 내보내기가 가능하므로 요청이 기다리지 않습니다.
+    """
+    global _setup_thread, _loaded
+    with _status_lock:
+        if _loaded:
+            return
+        _loaded = True
+        saved = _read_status()
+        if saved is not None and saved.get("state") == READY:
+            _status.update({key: saved.get(key) for key in _status})
+            if _status["pandoc_path"]:
+                # 서버 프로세스 전체(모든 세션 스레드)에서 준비 단계가 내려받은 pandoc 을 사용
+                os.environ["PYPANDOC_PANDOC"] = _status["pandoc_path"]
+            return
+        _setup_thread = threading.Thread(target=_setup, kwargs={"write_status": False}, name="export-setup",
+                                         daemon=True)
+        _setup_thread.start()
+
+
+def get_export_status() -> dict:
+    """state(pending/ready), converter(pandoc/builtin), pandoc_version, pandoc_path, pdf_engine, error"""
+    start_export_setup()
+    with _status_lock:
+        return dict(_status)
+
+
+#--------------------------------#
+#     Builtin DOCX Writer        #
+#--------------------------------#
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+
+def _style(style_id, name, run_props="", paragraph_props=""):
+    return (
+        f'<w:style w:type="paragraph" w:styleId="{style_id}"><w:name w:val="{name}"/>'
+        f'<w:basedOn w:val="Normal"/><w:qFormat/><w:pPr>{paragraph_props}</w:pPr><w:rPr>{run_props}</w:rPr></w:style>'
+    )
+
+
+_HEADING_SIZES = {1: 36, 2: 30, 3: 26, 4: 24, 5: 22, 6: 22}  # 반 포인트 단위
+_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles xmlns:w="{_W_NS}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="Malgun Gothic"/>'
+    '<w:sz w:val="22"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="120" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault></w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    + "".join(
+        _style(f"Heading{level}", f"heading {level}", f'<w:b/><w:sz w:val="{size}"/>',
+               '<w:keepNext/><w:spacing w:before="240" w:after="120"/>')
+        for level, size in _HEADING_SIZES.items()
+    )
+    + _style("ListParagraph", "List Paragraph", paragraph_props='<w:ind w:left="360" w:hanging="360"/>')
+    + _style("Quote", "Quote", "<w:i/>", '<w:ind w:left="720"/>')
+    + _style("Code", "Code", '<w:rFonts w:ascii="Consolas" w:hAnsi="Consolas"/><w:sz w:val="20"/>',
+             '<w:spacing w:after="0"/>')
+    + "</w:styles>"
+)
+
+_INLINE_PATTERN = re.compile(r"\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`")
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_HEADING_LINE = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET_LINE = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_NUMBERED_LINE = re.compile(r"^(\s*)(\d+[.)])\s+(.*)$")
+_RULE_LINE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+
+def _split_table_row(line):
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _parse_markdown(md_text):
+    """보고서에 쓰이는 마크다운 블록을 (종류, 값...) 튜플로 나눔
+
+    heading(level, text), list(indent, marker, text), quote(text), paragraph(text),
+    table(rows), code(lines), rule()
+    """
+    blocks, table_rows, code_lines, in_code = [], [], [], False
+
+    def flush_table():
+        if table_rows:
+            blocks.append(("table", list(table_rows)))
+            table_rows.clear()
+
+    for line in md_text.splitlines():
+        if line.strip().startswith("```"):
+            flush_table()
+            if in_code:
+                blocks.append(("code", list(code_lines)))
+                code_lines.clear()
+            in_code = not in_code
+            continue
+        if in_code:
+            code_lines.append(line)
+            continue
+
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            if not _TABLE_SEPARATOR.match(stripped):
+                table_rows.append(_split_table_row(stripped))
+            continue
+        flush_table()
+
+        if not stripped:
+            continue
+        if _RULE_LINE.match(stripped):
+            blocks.append(("rule",))
+        elif match := _HEADING_LINE.match(stripped):
+            blocks.append(("heading", len(match.group(1)), match.group(2).strip("# ")))
+        elif match := _BULLET_LINE.match(line):
+            blocks.append(("list", len(match.group(1)) // 2, "•", match.group(2)))
+        elif match := _NUMBERED_LINE.match(line):
+            blocks.append(("list", len(match.group(1)) // 2, match.group(2), match.group(3)))
+        elif stripped.startswith(">"):
+            blocks.append(("quote", stripped.lstrip("> ")))
+        else:
+            blocks.append(("paragraph", stripped))
+    flush_table()
+    if code_lines:
+        blocks.append(("code", code_lines))
+    return blocks
+
+
+def _inline(text, plain, strong, emphasis, code):
+    """**굵게**, *기울임*, `코드` 인라인 서식을 포맷별 함수로 변환해 이어 붙임"""
+    parts, position = [], 0
+    for match in _INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            parts.append(plain(text[position:match.start()]))
+        strong_text, emphasis_text, code_text = match.groups()
+        if strong_text is not None:
+            parts.append(strong(strong_text))
+        elif emphasis_text is not None:
+            parts.append(emphasis(emphasis_text))
+        else:
+            parts.append(code(code_text))
+        position = match.end()
+    if position < len(text):
+        parts.append(plain(text[position:]))
+    return "".join(parts)
+
+
+def _run(text, bold=False, italic=False, code=False):
+    props = ("<w:b/>" if bold else "") + ("<w:i/>" if italic else "")
+    if code:
+        props += '<w:rFonts w:ascii="Consolas" w:hAnsi="Consolas"/>'
+    text = escape(_INVALID_XML_CHARS.sub("", text))
+    return f'<w:r><w:rPr>{props}</w:rPr><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def _runs(text, bold=False):
+    return _inline(
+        text,
+        plain=lambda part: _run(part, bold=bold),
+        strong=lambda part: _run(part, bold=True),
+        emphasis=lambda part: _run(part, bold=bold, italic=True),
+        code=lambda part: _run(part, bold=bold, code=True),
+    )
+
+
+def _paragraph(text, style=None, indent_level=0, prefix=""):
+    props = f'<w:pStyle w:val="{style}"/>' if style else ""
+    if indent_level:
+        props += f'<w:ind w:left="{360 * (indent_level + 1)}" w:hanging="360"/>'
+    return f"<w:p><w:pPr>{props}</w:pPr>{_run(prefix) if prefix else ''}{_runs(text)}</w:p>"
+
+
+def _table(rows):
+    border = '<w:{side} w:val="single" w:sz="4" w:space="0" w:color="999999"/>'
+    borders = "".join(border.format(side=side) for side in ("top", "left", "bottom", "right", "insideH", "insideV"))
+    width = max(len(row) for row in rows)
+    body = []
+    for index, row in enumerate(rows):
+        cells = "".join(
+            f"<w:tc><w:p>{_runs(cell, bold=index == 0)}</w:p></w:tc>"
+            for cell in row + [""] * (width - len(row))
+        )
+        body.append(f"<w:tr>{cells}</w:tr>")
+    return (
+        f'<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/><w:tblBorders>{borders}</w:tblBorders></w:tblPr>'
+        f'{"".join(body)}</w:tbl><w:p/>'
+    )
+
+
+def _markdown_to_document_xml(md_text):
+    body = []
+    for kind, *value in _parse_markdown(md_text):
+        if kind == "heading":
+            body.append(_paragraph(value[1], style=f"Heading{value[0]}"))
+        elif kind == "list":
+            indent, marker, text = value
+            body.append(_paragraph(text, "ListParagraph", indent, prefix=f"{marker} "))
+        elif kind == "quote":
+            body.append(_paragraph(value[0], style="Quote"))
+        elif kind == "paragraph":
+            body.append(_paragraph(value[0]))
+        elif kind == "table":
+            body.append(_table(value[0]))
+        elif kind == "code":
+            body.extend(
+                f'<w:p><w:pPr><w:pStyle w:val="Code"/></w:pPr>{_run(line, code=True)}</w:p>' for line in value[0]
+            )
+        else:
+            body.append("<w:p/>")
+
+    return (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document xmlns:w="{_W_NS}"><w:body>'
+        f'{"".join(body)}<w:sectPr/></w:body></w:document>'
+    )
+
+
+def builtin_markdown_to_docx(md_text) -> bytes:
+    """pandoc 없이 마크다운을 DOCX 로 변환 (제목·목록·표·인용·코드·굵게/기울임 지원)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        docx.writestr("_rels/.rels", _ROOT_RELS)
+        docx.writestr("word/_rels/document.xml.rels", _DOCUMENT_RELS)
+        docx.writestr("word/styles.xml", _STYLES)
+        docx.writestr("word/document.xml", _markdown_to_document_xml(md_text))
+    return buffer.getvalue()
+
+
+#--------------------------------#
+#     Builtin HTML Writer        #
+#--------------------------------#
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: "Malgun Gothic", "NanumGothic", "Noto Sans CJK KR", "Apple SD Gothic Neo", sans-serif;
+       max-width: 860px; margin: 2em auto; padding: 0 1em; line-height: 1.6; }}
+table {{ border-collapse: collapse; margin: 1em 0; }}
+th, td {{ border: 1px solid #999; padding: 4px 8px; }}
+blockquote {{ margin-left: 1.5em; font-style: italic; }}
+pre {{ background: #f5f5f5; padding: 0.8em; white-space: pre-wrap; }}
+</style></head>
+<body>
+{body}
+</body></html>
+"""
+
+
+def _html_inline(text):
+    return _inline(
+        text,
+        plain=escape,
+        strong=lambda part: f"<strong>{escape(part)}</strong>",
+        emphasis=lambda part: f"<em>{escape(part)}</em>",
+        code=lambda part: f"<code>{escape(part)}</code>",
+    )
+
+
+def builtin_markdown_to_html(md_text, title=REPORT_TITLE) -> str:
+    """pandoc 없이 마크다운을 단독 HTML 문서로 변환"""
+    body = []
+    for kind, *value in _parse_markdown(md_text):
+        if kind == "heading":
+            body.append(f"<h{value[0]}>{_html_inline(value[1])}</h{value[0]}>")
+        elif kind == "list":
+            indent, marker, text = value
+            body.append(f'<p style="margin-left: {1.5 * (indent + 1)}em">{escape(marker)} {_html_inline(text)}</p>')
+        elif kind == "quote":
+            body.append(f"<blockquote>{_html_inline(value[0])}</blockquote>")
+        elif kind == "paragraph":
+            body.append(f"<p>{_html_inline(value[0])}</p>")
+        elif kind == "table":
+            header, *rows = value[0]
+            body.append(
+                "<table><tr>" + "".join(f"<th>{_html_inline(cell)}</th>" for cell in header) + "</tr>"
+                + "".join("<tr>" + "".join(f"<td>{_html_inline(cell)}</td>" for cell in row) + "</tr>" for row in rows)
+                + "</table>"
+            )
+        elif kind == "code":
+            body.append(f"<pre><code>{escape(chr(10).join(value[0]))}</code></pre>")
+        else:
+            body.append("<hr>")
+    return _HTML_TEMPLATE.format(title=escape(title), body="\n".join(body))
+
+
+#--------------------------------#
+#         Report Export          #
+#--------------------------------#
+def markdown_to_docx(md_text) -> bytes:
+    """마크다운을 DOCX 바이트로 변환
+
+    서버 시작 시 준비된 pandoc 이 있으면 사용하고, 아직 준비 중이거나 없거나 변환에
+    실패하면 내장 변환기를 사용합니다. 요청 중에 pandoc 을 내려받지 않습니다.
+    """
+    if get_export_status()["converter"] == PANDOC:
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                output_path = os.path.join(tmpdir, "research_report.docx")
+                pypandoc.convert_text(md_text, "docx", format="md", outputfile=output_path)
+                with open(output_path, "rb") as docx_file:
+                    return docx_file.read()
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"pandoc conversion failed, using builtin DOCX writer: {e}")
+    return builtin_markdown_to_docx(md_text)
+
+
+def markdown_to_html(md_text) -> str:
+    """마크다운을 단독 HTML 문서로 변환 (pandoc 이 있으면 pandoc, 없으면 내장 변환기)"""
+    if get_export_status()["converter"] == PANDOC:
+        try:
+            return pypandoc.convert_text(
+                md_text, "html", format="md",
+                extra_args=["--standalone", "--metadata", f"title={REPORT_TITLE}"]
+            )
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"pandoc conversion failed, using builtin HTML writer: {e}")
+    return builtin_markdown_to_html(md_text)
+
+
+def markdown_to_pdf(md_text) -> bytes:
+    """서버 시작 시 찾은 로컬 PDF 렌더러로 HTML 보고서를 PDF 로 변환"""
+    html = markdown_to_html(md_text)
+    engine = get_export_status()["pdf_engine"]
+    if engine == "weasyprint":
+        import weasyprint
+        return weasyprint.HTML(string=html).write_pdf()
+    if engine == "wkhtmltopdf":
+        completed = subprocess.run(
+            ["wkhtmltopdf", "--quiet", "--encoding", "utf-8", "-", "-"],
+            input=html.encode("utf-8"), capture_output=True, check=True, timeout=EXPORT_TIMEOUT
+        )
+        return completed.stdout
+    raise RuntimeError("PDF 렌더러(weasyprint 또는 wkhtmltopdf)가 설치되어 있지 않습니다.")
+
+
+# 형식 -> (화면 이름, 파일 확장자, MIME 타입, 변환 함수)
+EXPORT_FORMATS = {
+    "markdown": ("Markdown", "md", "text/markdown", lambda md_text: md_text.encode("utf-8")),
+    "docx": ("MS Word", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+             markdown_to_docx),
+    "html": ("HTML", "html", "text/html", lambda md_text: markdown_to_html(md_text).encode("utf-8")),
+    "pdf": ("PDF", "pdf", "application/pdf", markdown_to_pdf),
+}
+
+
+def available_formats() -> list:
+    """현재 서버에서 만들 수 있는 내보내기 형식 (PDF 는 로컬 렌더러가 있을 때만)"""
+    pdf_ready = get_export_status()["pdf_engine"] is not None
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "pdf" or pdf_ready]
+
+
+class ExportCache:
+    """보고서 해시·형식·변환기별 내보내기 결과를 백그라운드 스레드에서 만들고 보관
+
+    같은 키는 한 번만 변환하며, 최근 max_entries 개의 결과(Future)만 메모리에 남깁니다.
+    """
+
+    def __init__(self, max_entries=EXPORT_CACHE_ENTRIES, max_workers=EXPORT_WORKERS):
+        self.max_entries = max_entries
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-export")
+
+    @staticmethod
+    def make_key(md_text, fmt):
+        status = get_export_status()
+        digest = hashlib.sha256(md_text.encode("utf-8")).hexdigest()
+        return digest, fmt, status["converter"], status["pdf_engine"]
+
+    def request(self, md_text, fmt):
+        """변환을 요청 (이미 요청했거나 끝난 변환이면 그대로 사용) 하고 Future 를 반환"""
+        key = self.make_key(md_text, fmt)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._executor.submit(EXPORT_FORMATS[fmt][3], md_text)
+                self._futures[key] = future
+            self._futures.move_to_end(key)
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+        return future
+
+    def get(self, md_text, fmt):
+        """요청된 변환의 Future (요청한 적이 없으면 None)"""
+        with self._lock:
+            return self._futures.get(self.make_key(md_text, fmt))
+
+
+_export_cache = None
+
+
+def get_export_cache() -> ExportCache:
+    """서버 프로세스 전체에서 공유하는 내보내기 결과 캐시"""
+    global _export_cache
+    with _status_lock:
+        if _export_cache is None:
+            _export_cache = ExportCache()
+    return _export_cache
+
+
+#--------------------------------#
+#          Health Check          #
+#--------------------------------#
+def check_ready() -> bool:
+    """준비 단계가 기록한 상태 파일로 내보내기 준비 여부 확인 (컨테이너 헬스 체크용)
+
+    상태 파일은 컨테이너가 시작될 때마다 준비 단계(--setup)가 pending 으로 다시 쓰고 끝나면 ready 로 바꾸므로,
+    이전 실행이 남긴 파일을 읽을 일은 없습니다.
+    """
+    status = _read_status()
+    if status is None:
+        print("export: no status")
+        return False
+    if status.get("pandoc_path") and not Path(status["pandoc_path"]).exists():
+        print(f"export: pandoc missing ({status['pandoc_path']})")
+        return False
+    print(
+        f"export: {status['state']} (converter={status['converter']}, pandoc={status['pandoc_version']}, "
+        f"pdf={status.get('pdf_engine')})"
+    )
+    return status["state"] == READY
+
+
+if __name__ == "__main__":
+    # python -m src.utils.export --setup  (컨테이너 시작 시 streamlit 실행 전에 한 번)
+    # python -m src.utils.export --check  (헬스 체크)
+    if "--setup" in sys.argv:
+        logging.basicConfig(level=logging.INFO)
+        setup_export()
+    elif "--check" in sys.argv:
+        sys.exit(0 if check_ready() else 1)
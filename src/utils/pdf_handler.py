@@ -0,0 +1,190 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# 추출 텍스트 캐시 위치와 최대 용량 (환경변수로 조정 가능)
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR", ".cache/pdf_text")
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# 페이지 병렬 추출에 사용할 프로세스 수와, 병렬 추출을 시작할 최소 페이지 수
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "8"))
+
+
+#--------------------------------#
+#       PDF Text Cache           #
+#--------------------------------#
+class PDFTextCache:
+    """PDF 바이트의 SHA-256 해시를 키로 페이지별 추출 텍스트를 디스크에 저장하는 캐시
+
+    항목마다 `{sha256}.json` 파일 하나를 사용하며, 조회할 때마다 파일의 수정 시각을
+    갱신하여 최근 사용 순서를 기록합니다. 전체 크기가 max_bytes 를 넘으면 가장
+    오래 사용되지 않은 항목부터 삭제(LRU)합니다.
+    """
+
+    def __init__(self, cache_dir=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str):
+        """캐시된 페이지별 텍스트 목록을 반환 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                pages = json.load(f)
+            os.utime(path)  # LRU 순서 갱신
+            return pages
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, pages: list):
+        """페이지별 텍스트 목록을 저장하고 용량 제한을 넘으면 오래된 항목을 삭제"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.info(f"PDF text cache evicted {path.stem[:12]}")
+
+
+_cache = None
+
+
+def get_pdf_cache() -> PDFTextCache:
+    """프로세스 전체에서 공유하는 PDF 텍스트 캐시"""
+    global _cache
+    if _cache is None:
+        _cache = PDFTextCache()
+    return _cache
+
+
+#--------------------------------#
+#       PDF Text Extraction      #
+#--------------------------------#
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extract_pool() -> ProcessPoolExecutor:
+    """프로세스 전체에서 공유하는 페이지 추출 프로세스 풀 (처음 사용할 때 생성)
+
+    Streamlit 서버는 여러 스레드(LLM 이벤트 루프, 작업 감독, 내보내기 등)를 실행 중이므로
+    fork 대신 spawn 으로 작업 프로세스를 띄웁니다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, PDF_EXTRACT_WORKERS),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_extract_pool():
+    """작업 프로세스가 비정상 종료되어 풀을 쓸 수 없게 되면 다음 사용 때 새로 생성"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _extract_page_range(contents: bytes, start: int, stop: int) -> list:
+    """작업마다 PDF 를 한 번 파싱하고 [start, stop) 페이지의 텍스트를 추출"""
+    reader = PyPDF2.PdfReader(io.BytesIO(contents))
+    return [reader.pages[index].extract_text() for index in range(start, stop)]
+
+
+def _extract_pages_parallel(contents: bytes, page_count: int, on_progress=None) -> list:
+    """페이지를 구간으로 나누어 프로세스 풀에서 추출하고 페이지 순서대로 재조립
+
+    구간마다 PDF 를 다시 파싱하므로, 진행 표시를 위해 작업 프로세스 수의 2배 정도로만 나눕니다.
+    """
+    pages = [None] * page_count
+    chunk_size = max(1, -(-page_count // (max(1, PDF_EXTRACT_WORKERS) * 2)))
+    executor = get_extract_pool()
+    try:
+        futures = {
+            executor.submit(_extract_page_range, contents, start, min(start + chunk_size, page_count)): start
+            for start in range(0, page_count, chunk_size)
+        }
+        done = 0
+        for future in as_completed(futures):
+            chunk = future.result()
+            start = futures[future]
+            pages[start:start + len(chunk)] = chunk
+            done += len(chunk)
+            if on_progress:
+                on_progress(done, page_count)
+    except BrokenProcessPool:
+        _reset_extract_pool()
+        raise
+    return pages
+
+
+def extract_pdf_pages(contents: bytes, on_progress=None) -> list:
+    """PDF 바이트에서 페이지별 텍스트 목록을 추출 (같은 파일은 캐시에서 반환)
+
+    Args:
+        contents (bytes): PDF 파일 내용
+        on_progress (callable): 페이지 추출이 끝날 때마다 (완료 페이지 수, 전체 페이지 수)로
+            호출되는 콜백. 호출한 스레드에서 실행되므로 Streamlit 요소를 갱신해도 됩니다.
+    """
+    key = hashlib.sha256(contents).hexdigest()
+    cache = get_pdf_cache()
+
+    pages = cache.get(key)
+    if pages is not None:
+        logger.info(f"PDF text cache hit {key[:12]} ({len(pages)} pages)")
+        return pages
+
+    logger.info(f"PDF text cache miss {key[:12]}")
+    pdf = PyPDF2.PdfReader(io.BytesIO(contents))
+    page_count = len(pdf.pages)
+
+    if page_count >= PDF_PARALLEL_MIN_PAGES and PDF_EXTRACT_WORKERS > 1:
+        pages = _extract_pages_parallel(contents, page_count, on_progress)
+    else:
+        pages = []
+        for index, page in enumerate(pdf.pages, start=1):
+            pages.append(page.extract_text())
+            if on_progress:
+                on_progress(index, page_count)
+
+    cache.set(key, pages)
+    return pages
@@ -0,0 +1,83 @@
+# GapAnalysisCrew 구성(에이전트·LLM·작업·crew 생성) 시간 벤치마크
+# 페이지가 다시 실행될 때마다 crew 를 새로 만드는 상황을 가정하여, 이전 방식
+# (LLM 을 crew 마다 생성, 에이전트를 호출마다 생성)과 현재 방식(LLM 은 프로세스 전체에서,
+# 에이전트는 crew 안에서 재사용)의 구성 시간과 Agent·LLM 생성 횟수를 비교합니다.
+# LLM 은 호출하지 않습니다.
+#
+# 사용법 (프로젝트 루트에서):
+#   python test/crew_build_benchmark.py
+#   python test/crew_build_benchmark.py --repeat 50
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.components import researcher  # noqa: E402
+from src.components.researcher import GapAnalysisCrew  # noqa: E402
+
+AGENT_FACTORIES = ("pm", "performance_researcher", "achievement_researcher", "environment_researcher",
+                   "solution_researcher")
+
+
+class LegacyGapAnalysisCrew(GapAnalysisCrew):
+    """비교용: 에이전트 팩토리를 호출할 때마다 새 에이전트를 생성"""
+
+
+for name in AGENT_FACTORIES:
+    setattr(LegacyGapAnalysisCrew, name, getattr(GapAnalysisCrew, name).__wrapped__)
+
+
+class Counter:
+    """researcher 모듈의 Agent·LLM 생성자를 감싸 생성 횟수를 셈"""
+
+    def __init__(self):
+        self.counts = {"Agent": 0, "LLM": 0}
+
+    def wrap(self, name, cls):
+        def create(*args, **kwargs):
+            self.counts[name] += 1
+            return cls(*args, **kwargs)
+        return create
+
+
+def build(crew_cls):
+    crew = crew_cls("클라이언트 요약", "인터뷰 요약", "기타 파일 요약", reuse_outputs=False, memory_mode="off")
+    crew.crew(memory_config={"memory": False})
+
+
+def run(name, crew_cls, cached_llm, repeat):
+    counter = Counter()
+    original = researcher.Agent, researcher.LLM, researcher.get_llm
+    researcher.Agent = counter.wrap("Agent", original[0])
+    researcher.LLM = counter.wrap("LLM", original[1])
+    researcher.get_llm.cache_clear()
+    if not cached_llm:
+        researcher.get_llm = original[2].__wrapped__
+    try:
+        build(crew_cls)  # 첫 구성(임포트·LLM 생성 등)은 따로 측정
+        first_counts = dict(counter.counts)
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            build(crew_cls)
+        elapsed = (time.perf_counter() - started_at) / repeat
+    finally:
+        researcher.Agent, researcher.LLM, researcher.get_llm = original
+    per_build = {key: (counter.counts[key] - first_counts[key]) / repeat for key in counter.counts}
+    print(f"{name:<10}{elapsed * 1000:>12.2f}{first_counts['Agent']:>12}{first_counts['LLM']:>10}"
+          f"{per_build['Agent']:>14.0f}{per_build['LLM']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GapAnalysisCrew construction benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="측정할 crew 구성 횟수")
+    args = parser.parse_args()
+
+    print(f"{'':<10}{'ms/build':>12}{'1st agents':>12}{'1st LLMs':>10}{'agents/build':>14}{'LLMs/build':>12}")
+    run("legacy", LegacyGapAnalysisCrew, cached_llm=False, repeat=args.repeat)
+    run("current", GapAnalysisCrew, cached_llm=True, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
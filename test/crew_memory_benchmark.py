@@ -0,0 +1,75 @@
+# crew 메모리 모드별 벤치마크
+# 같은 입력으로 GapAnalysisCrew 를 메모리 모드(off / ephemeral / persistent)마다 실행하고
+# 실행 시간과 토큰 사용량을 비교합니다. (OPENAI_API_KEY 필요, 실제 LLM 호출 비용 발생)
+#
+# 사용법 (프로젝트 루트에서):
+#   python test/crew_memory_benchmark.py 클라이언트분석.md 인터뷰분석.md [기타파일분석.md]
+#   python test/crew_memory_benchmark.py --modes off ephemeral --repeat 2 ...
+#
+# 참고: 메모리 저장에 쓰이는 임베딩 호출은 crew 토큰 사용량(token_usage)에 포함되지 않으므로
+#       메모리 모드의 비용 차이는 실행 시간과 에이전트 프롬프트 토큰 증가분으로 확인합니다.
+import argparse
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.components.crew_memory import MEMORY_MODES  # noqa: E402
+from src.components.researcher import GapAnalysisCrew  # noqa: E402
+
+
+def run(mode, scope, client_analysis, interview_analysis, other_files_analysis):
+    crew = GapAnalysisCrew(
+        client_analysis=client_analysis,
+        interview_analysis=interview_analysis,
+        other_files_analysis=other_files_analysis,
+        reuse_outputs=False,  # 저장된 작업 결과를 재사용하면 비교가 되지 않으므로 항상 실행
+        memory_mode=mode,
+        memory_scope=scope,
+    )
+    started_at = time.perf_counter()
+    crew.analyze(client_analysis, interview_analysis, other_files_analysis)
+    elapsed = time.perf_counter() - started_at
+    usage = crew.last_usage
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "prompt": usage.prompt_tokens if usage else 0,
+        "completion": usage.completion_tokens if usage else 0,
+        "total": usage.total_tokens if usage else 0,
+        "requests": usage.successful_requests if usage else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GapAnalysisCrew memory mode benchmark")
+    parser.add_argument("client", help="클라이언트 요구사항 분석 결과 파일")
+    parser.add_argument("interview", help="인터뷰 분석 결과 파일")
+    parser.add_argument("other", nargs="?", help="기타 파일 분석 결과 파일")
+    parser.add_argument("--modes", nargs="+", choices=MEMORY_MODES, default=list(MEMORY_MODES))
+    parser.add_argument("--repeat", type=int, default=1, help="모드별 반복 횟수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client_analysis = Path(args.client).read_text(encoding="utf-8")
+    interview_analysis = Path(args.interview).read_text(encoding="utf-8")
+    other_files_analysis = Path(args.other).read_text(encoding="utf-8") if args.other else None
+
+    # persistent 모드는 반복 실행 간에 같은 세션 저장소를 사용 (두 번째 실행부터 이전 기억이 포함됨)
+    scope = f"benchmark-{uuid.uuid4()}"
+    results = [
+        run(mode, scope, client_analysis, interview_analysis, other_files_analysis)
+        for mode in args.modes
+        for _ in range(args.repeat)
+    ]
+
+    print(f"\n{'mode':<12}{'seconds':>10}{'prompt':>10}{'completion':>12}{'total':>10}{'requests':>10}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['seconds']:>10.1f}{r['prompt']:>10}{r['completion']:>12}{r['total']:>10}{r['requests']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# 공유 맥락(shared_context) 적용 전후 crew 작업 프롬프트 토큰 비교
+# GapAnalysisCrew 가 만드는 5개 작업의 프롬프트(작업 설명 + 기대 결과 + 맥락)를
+# crewAI 가 조합하는 방식대로 만들어 토큰 수를 셉니다. LLM 은 호출하지 않으며,
+# 에이전트 역할·목표 등 두 방식에 공통인 시스템 프롬프트는 제외합니다.
+#
+#   legacy:  요약 원문을 모든 작업 설명에 직접 넣고, 순차 실행이라 각 작업이
+#            앞선 모든 작업의 결과를 맥락으로 받음
+#   current: 요약 원문은 공유 맥락 작업 하나에 담아 각 작업의 context 로 연결하고,
+#            연구원 결과는 최종 보고서에만 전달
+#
+# 사용법 (프로젝트 루트에서):
+#   python test/shared_context_benchmark.py 클라이언트분석.md 인터뷰분석.md [기타파일분석.md]
+#   python test/shared_context_benchmark.py            # 파일이 없으면 예시 길이의 요약을 생성해 사용
+#
+# tiktoken 이 없으면 summarizer.estimate_tokens 의 보수적 추정치를 사용합니다.
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.components.researcher import SHARED_CONTEXT_REFERENCE, GapAnalysisCrew  # noqa: E402
+from src.components.summarizer import estimate_tokens  # noqa: E402
+
+# crewAI(0.102) 의 작업 프롬프트 조합 문구
+EXPECTED_OUTPUT_SUFFIX = (
+    "\n\nThis is the expected criteria for your final answer: {expected_output}\n"
+    "you MUST return the actual complete content as the final answer, not a summary."
+)
+CONTEXT_SUFFIX = "\n\nThis is the context you're working with:\n{context}"
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+
+def task_prompt(description, expected_output, context_outputs):
+    prompt = description + EXPECTED_OUTPUT_SUFFIX.format(expected_output=expected_output)
+    if context_outputs:
+        prompt += CONTEXT_SUFFIX.format(context=CONTEXT_DIVIDER.join(context_outputs))
+    return prompt
+
+
+def legacy_prompts(tasks, final_task, summaries, research_output):
+    """변경 전: 요약을 설명에 직접 넣고, 순차 실행에서 앞선 작업 결과를 모두 맥락으로 받음"""
+    client_analysis, interview_analysis, other_files_analysis = summaries
+    other = other_files_analysis if other_files_analysis else "없음"
+    research_text = (f"\n                > 클라이언트 요구사항: {client_analysis}"
+                     f"\n                > 인터뷰 분석 결과: {interview_analysis}"
+                     f"\n                > 기타 파일 분석 결과: {other}\n                ")
+    final_text = (f"> 클라이언트 맥락: {client_analysis}\n"
+                  f"            > 인터뷰 맥락: {interview_analysis}\n"
+                  f"            > 기타 파일 맥락: {other}")
+
+    prompts, previous_outputs = [], []
+    for task in tasks:
+        description = task.description.replace(SHARED_CONTEXT_REFERENCE, research_text)
+        prompts.append(task_prompt(description, task.expected_output, previous_outputs))
+        previous_outputs = [*previous_outputs, research_output]
+    description = final_task.description.replace(
+        f"{SHARED_CONTEXT_REFERENCE} 연구원들의 분석 결과도 함께 제공됩니다.", final_text
+    )
+    prompts.append(task_prompt(description, final_task.expected_output, previous_outputs))
+    return prompts
+
+
+def current_prompts(tasks, final_task, research_output):
+    """현재: 요약은 공유 맥락으로, 연구원 결과는 최종 보고서 맥락으로만 전달"""
+    prompts = []
+    for task in tasks:
+        prompts.append(task_prompt(task.description, task.expected_output,
+                                   [context.output.raw for context in task.context]))
+    shared_output = final_task.context[0].output.raw
+    prompts.append(task_prompt(final_task.description, final_task.expected_output,
+                               [shared_output, *[research_output] * len(tasks)]))
+    return prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared context prompt token comparison")
+    parser.add_argument("files", nargs="*", help="클라이언트 분석, 인터뷰 분석, (기타 파일 분석) 결과 파일")
+    parser.add_argument("--summary-chars", type=int, default=3000, help="예시 요약 길이(글자)")
+    parser.add_argument("--output-chars", type=int, default=2500, help="연구원 작업 결과로 가정할 길이(글자)")
+    args = parser.parse_args()
+
+    if args.files:
+        summaries = [Path(path).read_text(encoding="utf-8") for path in args.files[:3]]
+    else:
+        summaries = [("요약 내용 " * args.summary_chars)[:args.summary_chars] for _ in range(3)]
+    summaries = (summaries + [None] * 3)[:3]
+    research_output = ("연구원 분석 결과 " * args.output_chars)[:args.output_chars]
+
+    crew = GapAnalysisCrew(*summaries, reuse_outputs=False, memory_mode="off")
+    tasks = crew.research_tasks()
+    final_task = crew.compile_final_report(*summaries, context=[crew.shared_context(*summaries), *tasks])
+
+    names = ["performance", "achievement", "environment", "solution", "final_report"]
+    legacy = [estimate_tokens(prompt) for prompt in legacy_prompts(tasks, final_task, summaries, research_output)]
+    current = [estimate_tokens(prompt) for prompt in current_prompts(tasks, final_task, research_output)]
+
+    print(f"summaries: {[estimate_tokens(text or '') for text in summaries]} tokens, "
+          f"research output: {estimate_tokens(research_output)} tokens each\n")
+    print(f"{'task':<16}{'legacy':>10}{'current':>10}{'diff':>10}")
+    for name, before, after in zip(names, legacy, current):
+        print(f"{name:<16}{before:>10,}{after:>10,}{after - before:>+10,}")
+    print(f"{'total':<16}{sum(legacy):>10,}{sum(current):>10,}{sum(current) - sum(legacy):>+10,}")
+
+
+if __name__ == "__main__":
+    main()